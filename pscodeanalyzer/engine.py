@@ -1,6 +1,7 @@
 """Static code analyzer engine with configurable plug-in rules."""
 
 import argparse
+import bisect
 import glob
 import importlib
 import json
@@ -11,16 +12,44 @@ import platform
 import re
 import sys
 from abc import ABC, abstractmethod
+from array import array
 from collections import namedtuple
-from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from enum import Enum
+from itertools import chain, islice
 
 
 # GLOBAL VARIABLES
 _verbose = False
 _logger = logging.getLogger('engine')
 _config_evaluators = None
+_config_cache = {}
+_evaluator_classes = {}
+_worker_config = None
+_worker_evaluators = None
+_line_break_regex = re.compile(rb'\r\n?|\n')
+_interval_regex = re.compile(r'(\d+)(?:-(\d*))?$')
+# Escapes that match a single-byte class or an empty string
+_class_escapes = frozenset(bytes([c]) for c in b'AbBdDsSwWZ')
+# Escapes that match a single, fixed byte
+_char_escapes = {b'a': b'\a', b'f': b'\f', b'n': b'\n', b'r': b'\r',
+                 b't': b'\t', b'v': b'\v'}
 default_config_file_name = 'settings.json'
+regex_backend_env_var = 'PSCODEANALYZER_REGEX_BACKEND'
+
+
+# OPTIONAL DEPENDENCIES
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+_regex_engine = re
+if os.environ.get(regex_backend_env_var, 're').lower() == 're2':
+    try:
+        import re2 as _regex_engine
+    except ImportError:
+        _logger.warning('The "re2" regular expression backend is not '
+                        'installed; falling back to "re"')
 
 
 # MODEL
@@ -36,13 +65,28 @@ class ReportType(Enum):
 
 
 class FileReports:
-    """Pointer to a file path and its analysis reports."""
+    """Pointer to a file path and its analysis reports.
+
+    The cumulative status is maintained as reports are added, so reports
+    should be added with add_report() rather than to the list directly.
+    """
+
+    # Precedence of the report types for the cumulative status
+    _type_ranks = {
+        ReportType.INFO: 0,
+        ReportType.WARNING: 1,
+        ReportType.ERROR: 2,
+    }
 
-    def __init__(self, file_path, source_type=None, reports=[]):
+    def __init__(self, file_path, source_type=None, reports=None):
         """Create a FileReports object."""
         self.file_path = file_path
         self.source_type = source_type
-        self.reports = reports
+        self.reports = []
+        self._status = ReportType.INFO
+        self._positions = None
+        if reports:
+            self.add_reports(reports)
 
     def __str__(self):
         """Return a string representation of the object."""
@@ -62,22 +106,43 @@ class FileReports:
         """Return the file name from the path."""
         return os.path.basename(self.file_path)
 
+    def add_report(self, report):
+        """Add a report, updating the cumulative status."""
+        self.reports.append(report)
+        self._positions = None
+        if self._type_ranks[report.type] > self._type_ranks[self._status]:
+            self._status = report.type
+
+    def add_reports(self, reports):
+        """Add a list of reports, updating the cumulative status."""
+        self.reports.extend(reports)
+        self._positions = None
+        ranks = self._type_ranks
+        for r in reports:
+            if ranks[r.type] > ranks[self._status]:
+                self._status = r.type
+
+    @property
+    def positions(self):
+        """Return the (rule code, line, column) of the reports.
+
+        The frozenset is built on first access, and rebuilt only after
+        reports are added.
+        """
+        if self._positions is None:
+            self._positions = frozenset((r.rule_code, r.line, r.column)
+                                        for r in self.reports)
+        return self._positions
+
     @property
     def cumulative_status(self):
         """Return the cumulative status of the reports."""
-        status = ReportType.INFO
-        for r in self.reports:
-            if r.is_error:
-                status = ReportType.ERROR
-                break
-            elif r.is_warning:
-                status = ReportType.WARNING
-        return status
+        return self._status
 
     @property
     def is_error(self):
         """Return whether any reports are in error status."""
-        return (self.cumulative_status == ReportType.ERROR)
+        return (self._status == ReportType.ERROR)
 
 
 class Report:
@@ -94,6 +159,9 @@ class Report:
     - detail is a more descriptive message regarding the report.
     """
 
+    __slots__ = ('rule_code', 'message', 'type', 'line', 'column', 'text',
+                 'detail')
+
     def __init__(self, rule_code, message, report_type=ReportType.ERROR,
                  line=None, column=None, text=None, detail=None):
         """Create a report."""
@@ -137,6 +205,16 @@ class Report:
 
         return out
 
+    def as_tuple(self):
+        """Return the report's key fields as a tuple.
+
+        The tuple is (type value, rule code, line, column, message), and
+        is suitable for sinks that format the reports themselves (e.g.,
+        JSON serialization) without building the summary string.
+        """
+        return (self.type.value, self.rule_code, self.line, self.column,
+                self.message)
+
     @property
     def is_error(self):
         """Return True if the report is an error."""
@@ -153,13 +231,81 @@ class Report:
         return (self.type == ReportType.INFO)
 
 
+class FileContext:
+    """File-level state shared by the evaluators of a Proxy.
+
+    The file is memory-mapped on first access to contents, and its line
+    starts are computed on first access to line_starts, so that rules
+    operating on the same file need not repeat either step. A context
+    can be created either from a path (in which case the file is opened
+    and closed by the context) or from an already open binary file.
+
+    Where supported, the kernel is advised that the mapping will be read
+    sequentially; if prefetch is True (e.g., because several rules will
+    scan the file), it is also advised to read the whole file ahead.
+    """
+
+    __slots__ = ('path', 'prefetch', '_source_file', '_owns_file',
+                 '_contents', '_line_starts')
+
+    def __init__(self, path, source_file=None, prefetch=False):
+        """Create a context for the given file path or open file."""
+        self.path = path
+        self.prefetch = prefetch
+        self._source_file = source_file
+        self._owns_file = source_file is None
+        self._contents = None
+        self._line_starts = None
+
+    @property
+    def contents(self):
+        """Return the memory-mapped contents (empty bytes if empty)."""
+        if self._contents is None:
+            if self._source_file is None:
+                self._source_file = open(self.path, 'rb')
+            try:
+                self._contents = mmap.mmap(self._source_file.fileno(), 0,
+                                           access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                self._contents = b''
+            else:
+                # madvise() and its constants are platform-dependent
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    self._contents.madvise(mmap.MADV_SEQUENTIAL)
+                if self.prefetch and hasattr(mmap, 'MADV_WILLNEED'):
+                    self._contents.madvise(mmap.MADV_WILLNEED)
+        return self._contents
+
+    @property
+    def line_starts(self):
+        """Return the offsets at which each line of the file begins."""
+        if self._line_starts is None:
+            self._line_starts = _compute_line_starts(self.contents)
+        return self._line_starts
+
+    def close(self):
+        """Release the mapping and any file opened by the context.
+
+        The context remains usable: its contents would be mapped again
+        on next access.
+        """
+        if isinstance(self._contents, mmap.mmap):
+            self._contents.close()
+        self._contents = None
+        self._line_starts = None
+        if self._owns_file and self._source_file is not None:
+            self._source_file.close()
+            self._source_file = None
+
+
 class Evaluator(ABC):
     """Abstract base class for all evaluators (rules and proxies).
 
     The following configuration options apply:
     - "class": the name of the class to instantiate (should be "Rule",
-      "RegexRule", "Proxy", or a fully-qualified subclass of any of
-      these)
+      "RegexRule", "LineRule", "Proxy", "FusedRegexProxy",
+      "FusedLineProxy", or a fully-qualified subclass of any of these)
     - "description": used as the description for the evaluator instance
       (optional)
     """
@@ -171,16 +317,30 @@ class Evaluator(ABC):
         self.intervals = []
         _logger.debug(f'Instantiated {self.__class__.__name__}')
 
-    @abstractmethod
+    @property
+    def intervals(self):
+        """Return the list of intervals for evaluator applicability."""
+        return self._intervals
+
+    @intervals.setter
+    def intervals(self, intervals):
+        """Replace the list of intervals for evaluator applicability."""
+        self._intervals = intervals
+        self._interval_index = None
+
     def reset(self):
         """Reset the evaluator for a new evaluation.
 
-        To be implemented by subclasses, usually when proxied. Should
-        not be called from the constructor because subclasses may wish
-        to reset members that are not yet defined.
+        Does nothing by default; to be extended by subclasses, usually
+        when proxied. Should not be called from the constructor because
+        subclasses may wish to reset members that are not yet defined.
         """
         pass
 
+    def clear_intervals(self):
+        """Remove all intervals for evaluator applicability."""
+        self.intervals = []
+
     def add_interval_str(self, interval):
         """Add an interval for evaluator applicability from a string.
 
@@ -191,24 +351,19 @@ class Evaluator(ABC):
         - m  : results in an interval only for m (same as m-m)
         """
         if interval:
-            from_location = None
-            to_location = None
-            try:
-                if '-' in interval:
-                    parts = interval.split('-', maxsplit=1)
-                    if 1 <= len(parts) <= 2:
-                        if len(parts[0] > 0):
-                            from_location = int(parts[0])
-                            if len(parts) == 2:
-                                if len(parts[1] > 0):
-                                    to_location = int(parts[1])
-                else:
-                    from_location = int(interval)
-                if from_location:
-                    self.add_interval(from_location, to_location)
+            match = _interval_regex.match(interval.strip())
+            if match:
+                from_location = int(match.group(1))
+                if match.group(2) is None:
+                    # No hyphen: single location
+                    to_location = from_location
+                elif match.group(2):
+                    to_location = int(match.group(2))
                 else:
-                    _logger.warning(f'Invalid interval: "{interval}"')
-            except ValueError:
+                    # Trailing hyphen: until the end of the input
+                    to_location = None
+                self.add_interval(from_location, to_location)
+            else:
                 _logger.warning(f'Invalid interval: "{interval}"')
 
     def add_interval(self, from_location, to_location):
@@ -223,7 +378,8 @@ class Evaluator(ABC):
         if (from_location
                 and (to_location is None
                      or from_location <= to_location)):
-            self.intervals.append(Interval(from_location, to_location))
+            self._intervals.append(Interval(from_location, to_location))
+            self._interval_index = None
         else:
             _logger.warning('Invalid interval')
 
@@ -233,14 +389,12 @@ class Evaluator(ABC):
         Returns True if position is included within any of the
         configured intervals, or if no intervals have been configured.
         """
-        if self.intervals:
+        if self._intervals:
+            if self._interval_index is None:
+                self._interval_index = _index_intervals(self._intervals)
             end = position_start if position_end is None else position_end
-            for interval in self.intervals:
-                compare_end = end if interval.end is None else interval.end
-                if position_start <= compare_end and end >= interval.start:
-                    return True
-            else:
-                return False
+            return _overlaps_indexed_intervals(self._interval_index,
+                                               position_start, end)
         else:
             return True
 
@@ -287,6 +441,9 @@ class Rule(Evaluator):
       an explicit member of both lists, it is excluded (optional)
     """
 
+    # Whether evaluate() accepts a FileContext as its ctx keyword
+    uses_file_context = False
+
     def __init__(self, config):
         """Construct a rule with the given configuration."""
         super(Rule, self).__init__(config)
@@ -327,7 +484,7 @@ class Rule(Evaluator):
 
         Returns a list of Report objects.
         """
-        _logger.debug(f'Evaluating {self.__class__.__name__}')
+        _logger.debug('Evaluating %s', self.__class__.__name__)
         if source is None:
             raise ValueError(f'"{source}" cannot be None')
         if type(source) is str:
@@ -352,6 +509,20 @@ class Rule(Evaluator):
         # (e.g., when called through a Proxy)
         return []
 
+    def evaluate_context(self, source, ctx):
+        """Evaluate the rule, sharing the FileContext of a Proxy.
+
+        Rules that set uses_file_context to True receive ctx as a
+        keyword argument to evaluate(); all others are evaluated against
+        source alone, so that plug-ins defining evaluate(self, source)
+        keep working.
+
+        Returns a list of Report objects.
+        """
+        if self.uses_file_context and ctx is not None:
+            return self.evaluate(source, ctx=ctx)
+        return self.evaluate(source)
+
     @property
     def is_proxy(self):
         """Return True if the evaluator is a proxy."""
@@ -366,6 +537,12 @@ class Rule(Evaluator):
 class RegexRule(Rule):
     """Base class for code analyzer rules based on regular expressions.
 
+    Patterns are compiled with Python's re module, unless the
+    PSCODEANALYZER_REGEX_BACKEND environment variable is set to "re2"
+    and the google-re2 package is installed, in which case RE2's
+    linear-time engine is used. Patterns that RE2 does not support
+    (e.g., back-references or lookarounds) fall back to re.
+
     The following configuration options apply:
     - "pattern": a string with the pattern to search for
     - "invert": a boolean indicating if the match should be inverted; if
@@ -381,14 +558,20 @@ class RegexRule(Rule):
         pattern = config.get('pattern')
         if pattern:
             if type(pattern) is str:
-                self.regex = re.compile(pattern.encode())
-            elif type(pattern) is bytes:
-                self.regex = re.compile(pattern)
-            else:
+                pattern = pattern.encode()
+            elif type(pattern) is not bytes:
                 raise ValueError('unexpected type for pattern: '
                                  f'{type(pattern)}')
         else:
             raise ValueError('empty pattern is not allowed')
+        self.regex = re.compile(pattern)
+        self._required_literal = _extract_required_literal(self.regex)
+        if _regex_engine is not re:
+            try:
+                self.regex = _regex_engine.compile(pattern)
+            except _regex_engine.error:
+                _logger.info(f'Pattern "{pattern.decode()}" not supported '
+                             f'by {_regex_engine.__name__}; using re')
         self.invert = config.get('invert', False)
         default_msg = f'Pattern {"not " if self.invert else ""}matched'
         self.default_message = config.get('description', default_msg)
@@ -399,17 +582,32 @@ class RegexRule(Rule):
                 f'"{self.regex.pattern.decode()}", invert: {self.invert}, '
                 f'default_message: "{self.default_message}"{"}"}')
 
-    def evaluate(self, source):
+    @property
+    def uses_file_context(self):
+        """Return True if the rule can be evaluated against a FileContext.
+
+        Subclasses that override evaluate or evaluate_file are always
+        given the source instead, so that their overrides are run.
+        """
+        rule_class = type(self)
+        return (rule_class.evaluate is RegexRule.evaluate
+                and rule_class.evaluate_file is RegexRule.evaluate_file)
+
+    def evaluate(self, source, ctx=None):
         """Evaluate the rule against the referenced source.
 
         source can be a path to a file or an open file-like object.
         Subclasses are free to treat source differently (e.g., a string
         with the code to analyze, a parse tree, etc.). Unlike its
-        superclass, RegexRule treats files in binary mode.
+        superclass, RegexRule treats files in binary mode, and uses the
+        mapped contents and line starts of ctx when provided (unless
+        evaluate_file is overridden).
 
         Returns a list of Report objects.
         """
-        _logger.debug(f'Evaluating {self.__class__.__name__}')
+        _logger.debug('Evaluating %s', self.__class__.__name__)
+        if ctx is not None and self.uses_file_context:
+            return self._evaluate_context(ctx)
         if source is None:
             raise ValueError(f'"{source}" cannot be None')
         if type(source) is str:
@@ -429,70 +627,132 @@ class RegexRule(Rule):
 
         Returns a list of Report objects.
         """
-        reports = []
+        ctx = FileContext(getattr(source_file, 'name', None),
+                          source_file=source_file)
         try:
-            contents = mmap.mmap(source_file.fileno(), 0,
-                                 access=mmap.ACCESS_READ)
-            empty = False
-        except ValueError:
-            empty = True
-        if not empty:
-            if self.invert and not self.intervals:
+            return self._evaluate_context(ctx)
+        finally:
+            ctx.close()
+
+    def _evaluate_context(self, ctx):
+        """Evaluate the rule against the file of a FileContext.
+
+        Returns a list of Report objects.
+        """
+        reports = []
+        contents = ctx.contents
+        if contents:
+            if (self._required_literal is not None
+                    and contents.find(self._required_literal) == -1):
+                # The pattern cannot match without its required literal
+                if self.invert:
+                    reports.append(self._not_found_report())
+            elif self.invert and not self.intervals:
                 match = self.regex.search(contents)
                 # Not matching is an error
                 if not match:
-                    pattern_str = self.regex.pattern.decode()
-                    report = Report(
-                        self.code, self.default_message,
-                        report_type=self.default_report_type,
-                        detail=f'The pattern "{pattern_str}" was not found.')
-                    reports.append(report)
+                    reports.append(self._not_found_report())
             else:
-                matches = self.regex.finditer(contents)
-                for match in matches:
+                # Checking matches against byte offsets avoids any line
+                # calculations for matches outside of the intervals
+                byte_intervals = self._byte_intervals(ctx)
+                if byte_intervals:
+                    scan_end = byte_intervals[1][-1]
+                found = False
+                for match in self.regex.finditer(contents):
                     start = match.start()
                     end = match.end()
-                    contents.seek(0)
-                    before = contents.read(start).decode()
-                    text = contents.read(end - start).decode()
-                    line_start = before.count('\r') + 1
-                    if line_start == 1:
-                        # Match starts on line 1
-                        column = start + 1
-                    else:
-                        # Match starts on another line
-                        last_newline = before.rfind('\n')
-                        if last_newline == -1:
-                            last_newline = before.rfind('\r')
-                        column = start - last_newline
-                    if self.intervals:
-                        # Calculate end line of match
-                        line_end = line_start + text.rstrip('\r\n').count('\r')
-                    else:
-                        # End line is unimportant
-                        line_end = line_start
-                    if self.is_position_in_intervals(line_start,
-                                                     position_end=line_end):
-                        if self.invert:
+                    if byte_intervals:
+                        if start > scan_end:
+                            # No further match can be within the intervals
                             break
-                        else:
-                            report = Report(
-                                self.code, self.default_message,
-                                report_type=self.default_report_type,
-                                line=line_start, column=column,
-                                text=text)
-                            reports.append(report)
-                else:
+                        if not self._is_match_in_intervals(
+                                contents, start, end, byte_intervals):
+                            continue
+                    found = True
                     if self.invert:
-                        pattern_str = self.regex.pattern.decode()
-                        report = Report(
-                            self.code, self.default_message,
-                            report_type=self.default_report_type,
-                            detail=(f'The pattern "{pattern_str}" was not '
-                                    'found.'))
-                        reports.append(report)
+                        break
+                    reports.append(self._match_report(ctx, start, end))
+                if self.invert and not found:
+                    reports.append(self._not_found_report())
         return reports
 
+    def _byte_intervals(self, ctx):
+        """Translate the line intervals into byte offsets of the file.
+
+        Each interval spans from the first byte of its first line up to
+        the last byte of its last line. Returns an index of the byte
+        intervals for _overlaps_indexed_intervals, or None if the rule
+        has no intervals.
+        """
+        if not self.intervals:
+            return None
+        line_starts = ctx.line_starts
+        size = len(ctx.contents)
+        byte_intervals = []
+        for iv in self.intervals:
+            iv_start = (line_starts[iv.start - 1]
+                        if iv.start <= len(line_starts) else size)
+            iv_end = (line_starts[iv.end]
+                      if iv.end is not None and iv.end < len(line_starts)
+                      else size)
+            byte_intervals.append((iv_start, iv_end - 1))
+        return _index_intervals(byte_intervals)
+
+    @staticmethod
+    def _is_match_in_intervals(contents, start, end, byte_intervals):
+        """Determine if a match is within any of the byte intervals.
+
+        Trailing line breaks of the match are ignored.
+        """
+        last = max(start, end - 1)
+        while last > start and contents[last] in b'\r\n':
+            last -= 1
+        return _overlaps_indexed_intervals(byte_intervals, start, last)
+
+    def _match_report(self, ctx, start, end):
+        """Return the report for a match of the pattern."""
+        line_starts = ctx.line_starts
+        line_index = bisect.bisect_right(line_starts, start) - 1
+        # Only the matched bytes are ever decoded
+        text = ctx.contents[start:end].decode(errors='replace')
+        return Report(self.code, self.default_message,
+                      report_type=self.default_report_type,
+                      line=(line_index + 1),
+                      column=(start - line_starts[line_index] + 1),
+                      text=text)
+
+    def _not_found_report(self):
+        """Return the report raised when an inverted pattern is not found."""
+        pattern_str = self.regex.pattern.decode()
+        return Report(self.code, self.default_message,
+                      report_type=self.default_report_type,
+                      detail=f'The pattern "{pattern_str}" was not found.')
+
+
+class LineRule(Rule):
+    """Base class for rules that examine a source file line by line.
+
+    Subclasses implement check_line, which is called for every line of
+    the file (including its line break) and is responsible for checking
+    the intervals. A FusedLineProxy can read the file once for all of
+    its LineRules.
+    """
+
+    def evaluate_file(self, source_file):
+        """Evaluate the rule against each line of the open file."""
+        reports = []
+        for line, text in enumerate(source_file, start=1):
+            report = self.check_line(line, text)
+            if report is not None:
+                reports.append(report)
+        return reports
+
+    @abstractmethod
+    def check_line(self, line, text):
+        """Check a single line, returning a Report or None."""
+        pass
+
 
 class Proxy(Evaluator):
     """Proxy class for grouping evaluators.
@@ -512,6 +772,8 @@ class Proxy(Evaluator):
         """
         super(Proxy, self).__init__(config)
         self.file_path = None
+        self._normalized_path = None
+        self.file_context = None
         self.source_type = None
         self.evaluators = [_create_evaluator(ev) for ev in
                            config['evaluators']]
@@ -532,19 +794,46 @@ class Proxy(Evaluator):
             ev.reset()
             ev.intervals = self.intervals.copy()
 
+    def clear_intervals(self):
+        """Remove all intervals from the proxy and its evaluators."""
+        super(Proxy, self).clear_intervals()
+        for ev in self.evaluators:
+            ev.clear_intervals()
+
+    def add_interval(self, from_location, to_location):
+        """Add an interval to the proxy and its evaluators."""
+        super(Proxy, self).add_interval(from_location, to_location)
+        for ev in self.evaluators:
+            ev.add_interval(from_location, to_location)
+
     def attach(self, file_path, source_type=None):
         """Attach the Proxy to a specific file and reset it.
 
-        Does nothing if already attached to that file.
+        The proxy and its evaluators are reset even if already attached
+        to that file, since it may be analyzed again with other
+        intervals; only its FileContext is then kept. Paths are compared
+        after normalization, without querying the file system.
+        """
+        self._attach(file_path, os.path.normcase(os.path.abspath(file_path)),
+                     source_type)
+
+    def _attach(self, file_path, normalized_path, source_type):
+        """Attach the Proxy to a file whose path is already normalized.
+
+        Nested proxies are attached with the same normalized path, so
+        that it is only computed once.
         """
         self.source_type = source_type
-        if (self.file_path is None
-                or not os.path.samefile(self.file_path, file_path)):
+        if self._normalized_path != normalized_path:
             self.file_path = file_path
-            for ev in self.evaluators:
-                if ev.is_proxy:
-                    ev.attach(file_path, source_type=source_type)
-            self.reset()
+            self._normalized_path = normalized_path
+            if self.file_context is not None:
+                self.file_context.close()
+            self.file_context = FileContext(file_path, prefetch=True)
+        for ev in self.evaluators:
+            if ev.is_proxy:
+                ev._attach(file_path, normalized_path, source_type)
+        self.reset()
 
     def _evaluate_evaluator(self, evaluator, exhaustive):
         """Evaluate an evaluator, returning its reports."""
@@ -555,7 +844,7 @@ class Proxy(Evaluator):
 
     def _evaluate_rule(self, rule):
         """Evaluate a rule, returning its reports."""
-        return rule.evaluate(self.file_path)
+        return rule.evaluate_context(self.file_path, self.file_context)
 
     def _evaluate_proxy(self, proxy, exhaustive):
         """Evaluate a proxy, returning its reports."""
@@ -575,27 +864,36 @@ class Proxy(Evaluator):
 
         Returns a list of Report objects.
         """
-        _logger.debug(f'Evaluating {self.__class__.__name__}')
+        _logger.debug('Evaluating %s', self.__class__.__name__)
         all_reports = []
         if self.file_path:
-            for i, ev in enumerate(self.evaluators):
-                if i > 0:
-                    self._propagate_state(self.evaluators[i - 1], ev)
-                if ev.is_proxy or ev.applies_to_source_type(self.source_type):
-                    reports = self._evaluate_evaluator(ev, exhaustive)
-                    if reports:
-                        all_reports.extend(reports)
-                        if not exhaustive:
-                            for r in reports:
-                                if r.is_error:
-                                    break
-                            else:
-                                # Inner loop did not break
-                                continue
-                            # Inner loop ended in break
-                            break
+            try:
+                report_lists = self._evaluate_evaluators(exhaustive)
+            finally:
+                # Release the shared mapping once all rules have run
+                self.file_context.close()
+            all_reports = list(chain.from_iterable(report_lists))
         return all_reports
 
+    def _evaluate_evaluators(self, exhaustive):
+        """Evaluate the proxied evaluators.
+
+        Returns a list with the non-empty lists of Report objects of the
+        evaluators, in order.
+        """
+        report_lists = []
+        for i, ev in enumerate(self.evaluators):
+            if i > 0:
+                self._propagate_state(self.evaluators[i - 1], ev)
+            if ev.is_proxy or ev.applies_to_source_type(self.source_type):
+                reports = self._evaluate_evaluator(ev, exhaustive)
+                if reports:
+                    report_lists.append(reports)
+                    if not exhaustive and any(r.type is ReportType.ERROR
+                                              for r in reports):
+                        break
+        return report_lists
+
     @property
     def is_proxy(self):
         """Return True if the evaluator is a proxy."""
@@ -610,6 +908,182 @@ class Proxy(Evaluator):
         return count
 
 
+class FusedRegexProxy(Proxy):
+    """Proxy class that scans a file once for all of its RegexRules.
+
+    The patterns of the proxied RegexRules are combined into a single
+    alternation, so that the file is scanned by the regular expression
+    engine once rather than once per rule. Each match is then dispatched
+    to the rule whose pattern matched, which reports it as it would have
+    on its own.
+
+    Since the combined scan yields non-overlapping matches, a match of
+    one rule could hide the matches of other rules, or move where their
+    next matches start. Hence, the result of the combined scan is only
+    kept when all of its matches belong to a single rule (or there are
+    none), in which case it is exactly what each rule would have found
+    on its own; otherwise, every rule but the one matched is evaluated
+    on its own, as is every rule when more than one is matched. The
+    following rules are not fused either: inverted rules, subclasses of
+    RegexRule, and patterns with flags, numbered back-references or
+    conditionals.
+
+    The configuration options are those of Proxy.
+    """
+
+    # Patterns that cannot be embedded within an alternation
+    _unfusable_regex = re.compile(rb'\\[1-9]|\(\?\(')
+
+    def __init__(self, config):
+        """Construct a fused regular expression proxy."""
+        super(FusedRegexProxy, self).__init__(config)
+        self._fused_rules = [ev for ev in self.evaluators
+                             if self._is_fusable(ev)]
+        # Fused regexes and their group names, keyed by the tuple of
+        # rules that apply to a source type
+        self._fused_regexes = {}
+        self._fused_reports = {}
+
+    @classmethod
+    def _is_fusable(cls, ev):
+        """Return True if the evaluator can be part of the fused scan."""
+        if type(ev) is not RegexRule or ev.invert:
+            return False
+        pattern = ev.regex.pattern
+        return (re.compile(pattern).flags == 0
+                and not cls._unfusable_regex.search(pattern))
+
+    def _get_fused_regex(self, rules):
+        """Return the fused regex of the rules, and its group names.
+
+        Returns (None, None) if the patterns cannot be fused.
+        """
+        fused = self._fused_regexes.get(rules)
+        if fused is None:
+            groups = []
+            names = {}
+            for rule in rules:
+                name = f'_r{len(groups)}'
+                groups.append(b'(?P<' + name.encode() + b'>'
+                              + rule.regex.pattern + b')')
+                names[name] = rule
+            try:
+                fused = (re.compile(b'|'.join(groups)), names)
+            except re.error as e:
+                _logger.warning(f'{self.__class__.__name__}: patterns '
+                                f'cannot be fused ({str(e)})')
+                fused = (None, None)
+            self._fused_regexes[rules] = fused
+        return fused
+
+    def _scan_fused(self):
+        """Scan the attached file once, collecting each rule's reports.
+
+        Only the rules that apply to the source type of the file are
+        fused, so that inapplicable rules cannot hide any matches. The
+        reports are only kept for the rules whose results cannot have
+        been altered by the matches of other rules.
+        """
+        rules = tuple(ev for ev in self._fused_rules
+                      if ev.applies_to_source_type(self.source_type))
+        if not rules:
+            return
+        fused_regex, names = self._get_fused_regex(rules)
+        if fused_regex is None:
+            # The rules are evaluated on their own
+            return
+        self._fused_reports = {ev: [] for ev in rules}
+        ctx = self.file_context
+        contents = ctx.contents
+        if contents:
+            byte_intervals = {ev: ev._byte_intervals(ctx) for ev in rules}
+            matched_rules = set()
+            for match in fused_regex.finditer(contents):
+                rule = names[match.lastgroup]
+                matched_rules.add(rule)
+                if len(matched_rules) > 1:
+                    # The matches of each rule may interfere with the
+                    # others', so all are evaluated on their own
+                    self._fused_reports = {}
+                    return
+                start = match.start()
+                end = match.end()
+                if (not byte_intervals[rule]
+                        or rule._is_match_in_intervals(
+                            contents, start, end, byte_intervals[rule])):
+                    self._fused_reports[rule].append(
+                        rule._match_report(ctx, start, end))
+            if matched_rules:
+                # The other rules may have matches hidden by this one's
+                rule = matched_rules.pop()
+                self._fused_reports = {rule: self._fused_reports[rule]}
+
+    def _evaluate_rule(self, rule):
+        """Evaluate a rule, returning its reports."""
+        if rule in self._fused_reports:
+            return self._fused_reports[rule]
+        return super(FusedRegexProxy, self)._evaluate_rule(rule)
+
+    def _evaluate_evaluators(self, exhaustive):
+        """Scan for the fused rules, then evaluate all evaluators."""
+        if self._fused_rules:
+            self._scan_fused()
+        try:
+            return super(FusedRegexProxy, self)._evaluate_evaluators(
+                exhaustive)
+        finally:
+            # The reports are only valid for this evaluation
+            self._fused_reports = {}
+
+
+class FusedLineProxy(Proxy):
+    """Proxy class that reads a file once for all of its LineRules.
+
+    Each line is passed to the check_line method of every applicable
+    LineRule in turn, instead of each rule iterating the file on its
+    own. Any other evaluators are evaluated as they would be by Proxy.
+
+    The configuration options are those of Proxy.
+    """
+
+    def __init__(self, config):
+        """Construct a fused line proxy."""
+        super(FusedLineProxy, self).__init__(config)
+        self._line_rules = [ev for ev in self.evaluators
+                            if isinstance(ev, LineRule)]
+        self._line_reports = {}
+
+    def _scan_lines(self):
+        """Read the attached file once, collecting each rule's reports."""
+        rules = [ev for ev in self._line_rules
+                 if ev.applies_to_source_type(self.source_type)]
+        self._line_reports = {ev: [] for ev in rules}
+        if rules:
+            with open(self.file_path) as source_file:
+                for line, text in enumerate(source_file, start=1):
+                    for rule in rules:
+                        report = rule.check_line(line, text)
+                        if report is not None:
+                            self._line_reports[rule].append(report)
+
+    def _evaluate_rule(self, rule):
+        """Evaluate a rule, returning its reports."""
+        if rule in self._line_reports:
+            return self._line_reports[rule]
+        return super(FusedLineProxy, self)._evaluate_rule(rule)
+
+    def _evaluate_evaluators(self, exhaustive):
+        """Read the lines for the LineRules, then evaluate all evaluators."""
+        if self._line_rules:
+            self._scan_lines()
+        try:
+            return super(FusedLineProxy, self)._evaluate_evaluators(
+                exhaustive)
+        finally:
+            # The reports are only valid for this evaluation
+            self._line_reports = {}
+
+
 # PRIVATE FUNCTIONS
 def _print_verbose(text, end='\n', flush=True):
     """Print to stdout if verbose output is enabled."""
@@ -617,93 +1091,403 @@ def _print_verbose(text, end='\n', flush=True):
         print(text, end=end, flush=flush)
 
 
+def _index_intervals(intervals):
+    """Return an index of intervals for _overlaps_indexed_intervals.
+
+    intervals is an iterable of (start, end) pairs of integers, where
+    both ends are included and an end of None means there is no upper
+    bound. The index is a pair of arrays: the interval starts in
+    ascending order, and the maximum end among the intervals up to each
+    of those starts.
+    """
+    starts = array('q')
+    max_ends = array('q')
+    max_end = -sys.maxsize - 1
+    for start, end in sorted(intervals, key=lambda iv: iv[0]):
+        max_end = max(max_end, sys.maxsize if end is None else end)
+        starts.append(start)
+        max_ends.append(max_end)
+    return starts, max_ends
+
+
+def _overlaps_indexed_intervals(index, start, end):
+    """Determine if [start, end] overlaps any of the indexed intervals."""
+    starts, max_ends = index
+    # Only the intervals starting no later than end can overlap
+    i = bisect.bisect_right(starts, end)
+    return i > 0 and max_ends[i - 1] >= start
+
+
+def _compute_line_starts(contents):
+    """Return the offsets at which each line of contents begins.
+
+    contents is a bytes-like object (e.g., an mmap). Line breaks can be
+    any of CR+LF, LF or CR. The offsets are returned as a sorted
+    array suitable for bisection.
+    """
+    line_starts = array('Q', [0])
+    line_starts.extend(m.end() for m in _line_break_regex.finditer(contents))
+    return line_starts
+
+
+def _extract_required_literal(regex):
+    """Return a literal byte string that every match of regex contains.
+
+    The pattern is scanned conservatively: only unquantified literal
+    bytes outside of groups and character classes are considered, and
+    patterns with alternations or flags that alter literal matching are
+    skipped. The longest such run of bytes is returned, or None if no
+    literal can be safely determined.
+    """
+    if regex.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+    pattern = regex.pattern
+    runs = []
+    run = bytearray()
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i:i + 1]
+        if c == b'\\':
+            escaped = pattern[i + 1:i + 2]
+            i += 2
+            if escaped.isalnum():
+                if escaped in _class_escapes:
+                    # Special sequence (\b, \s, \d, etc.)
+                    runs.append(bytes(run))
+                    run = bytearray()
+                elif escaped in _char_escapes:
+                    if depth == 0:
+                        run += _char_escapes[escaped]
+                else:
+                    # Escapes with arguments (hexadecimal, octal,
+                    # back-references, etc.) are not worth decoding
+                    return None
+            elif depth == 0 and escaped:
+                run += escaped
+            continue
+        if c == b'[':
+            # Skip the character class, which may begin with "]" or "^]"
+            i += 1
+            if pattern[i:i + 1] == b'^':
+                i += 1
+            if pattern[i:i + 1] == b']':
+                i += 1
+            while i < len(pattern) and pattern[i:i + 1] != b']':
+                i += 2 if pattern[i:i + 1] == b'\\' else 1
+            runs.append(bytes(run))
+            run = bytearray()
+        elif c == b'|':
+            # Alternations make every literal optional
+            return None
+        elif c == b'(':
+            depth += 1
+            runs.append(bytes(run))
+            run = bytearray()
+        elif c == b')':
+            depth -= 1
+        elif c in (b'?', b'*', b'{'):
+            # The preceding item is optional or repeated an unknown
+            # number of times
+            if run:
+                del run[-1]
+            runs.append(bytes(run))
+            run = bytearray()
+            if c == b'{':
+                while i < len(pattern) and pattern[i:i + 1] != b'}':
+                    i += 1
+        elif c == b'+':
+            # The preceding item is required at least once
+            runs.append(bytes(run))
+            run = bytearray()
+        elif c in (b'.', b'^', b'$'):
+            runs.append(bytes(run))
+            run = bytearray()
+        elif depth == 0:
+            run += c
+        i += 1
+    runs.append(bytes(run))
+    literal = max(runs, key=len)
+    return literal if literal else None
+
+
+def _freeze_substitutions(substitutions):
+    """Return a hashable equivalent of a substitutions dictionary."""
+    return tuple(sorted(substitutions.items())) if substitutions else None
+
+
 def _load_config(path, profile, substitutions):
-    """Load the configuration from a JSON file."""
+    """Load the configuration from a JSON file.
+
+    The evaluator configurations resulting from the file, profile and
+    substitutions are cached, and reused for as long as the file is not
+    modified.
+    """
     _logger.info(f'Loading profile "{profile}" from file "{path}"')
+    global _config_evaluators
     if os.path.isfile(path):
-        with open(path) as config_file:
-            config = json.load(config_file)
+        cache_key = (path, os.stat(path).st_mtime_ns, profile,
+                     _freeze_substitutions(substitutions))
+        if cache_key in _config_cache:
+            _logger.debug('Using cached configuration')
+            _config_evaluators = _config_cache[cache_key]
+            return
+        with open(path, 'rb') as config_file:
+            config = _json_loads(config_file.read())
             if config:
                 config_profile = config['profiles'][profile]
                 config_subs = config_profile.get('substitutions')
-                global _config_evaluators
                 _config_evaluators = config_profile['evaluators']
                 if config_subs or substitutions:
-                    subs = dict(config_subs)
+                    subs = dict(config_subs or {})
                     if substitutions:
                         subs.update(substitutions)
+                    # A single pass replaces all variables at once
+                    pattern = re.compile(
+                        '#(' + '|'.join(map(re.escape, subs)) + ')#')
+
+                    def repl(match):
+                        return subs[match.group(1)]
+
                     for ev in _config_evaluators:
-                        _do_config_substitutions(ev, subs)
+                        _do_config_substitutions(ev, pattern, repl)
+                _config_cache[cache_key] = _config_evaluators
     else:
         raise ValueError(f'File "{path}" not found')
 
 
-def _do_config_substitutions(config, substitutions):
-    """Perform configuration value substitutions from a dictionary.
+def _do_config_substitutions(config, pattern, repl):
+    """Perform configuration value substitutions with a regex.
 
-    This function will be called recursively, where config will be
-    either a dictionary loaded from JSON or a list of such dictionaries.
+    pattern matches any "#VARIABLE#" to substitute, and repl returns the
+    replacement for such a match. This function will be called
+    recursively, where config will be either a dictionary loaded from
+    JSON or a list of values.
     """
-    if substitutions:
-        if isinstance(config, dict):
-            # Loop over dictionary elements
-            for key in iter(config):
-                val = config[key]
-                if isinstance(val, (dict, list)):
-                    _do_config_substitutions(val, substitutions)
-                elif isinstance(val, str):
-                    for old in iter(substitutions):
-                        val = val.replace(f'#{old}#', substitutions[old])
-                    config[key] = val
-        elif isinstance(config, list):
-            # Loop over list items recursively
-            for item in config:
-                _do_config_substitutions(item, substitutions)
+    if isinstance(config, dict):
+        # Loop over dictionary elements
+        for key in iter(config):
+            val = config[key]
+            if isinstance(val, (dict, list)):
+                _do_config_substitutions(val, pattern, repl)
+            elif isinstance(val, str):
+                config[key] = pattern.sub(repl, val)
+    elif isinstance(config, list):
+        # Loop over list items recursively
+        for i, item in enumerate(config):
+            if isinstance(item, str):
+                config[i] = pattern.sub(repl, item)
+            else:
+                _do_config_substitutions(item, pattern, repl)
 
 
 def _create_evaluator(config):
-    """Create an evaluator based on the given configuration."""
+    """Create an evaluator based on the given configuration.
+
+    Classes are resolved from their names once, and cached thereafter.
+    """
     class_name = config['class']
-    parts = class_name.rsplit(sep='.', maxsplit=1)
-    if len(parts) == 1:
-        _logger.debug(f'Creating evaluator {parts[-1]}')
-        ev = globals()[parts[-1]](config)
-    else:
-        module = sys.modules.get(parts[0])
-        if not module:
-            _logger.debug(f'Importing module {parts[0]}')
-            module = importlib.import_module(parts[0])
-        _logger.debug(f'Creating evaluator {parts[-1]}')
-        ev = getattr(module, parts[-1])(config)
-    return ev
-
-
-def _flatten(lst):
-    """Generate individual items from a multiple-level list."""
-    for elem in lst:
-        if isinstance(elem, Iterable) and not isinstance(elem, (str, bytes)):
-            yield from _flatten(elem)
+    evaluator_class = _evaluator_classes.get(class_name)
+    if evaluator_class is None:
+        parts = class_name.rsplit(sep='.', maxsplit=1)
+        if len(parts) == 1:
+            evaluator_class = globals()[parts[-1]]
         else:
-            yield elem
+            module = sys.modules.get(parts[0])
+            if not module:
+                _logger.debug(f'Importing module {parts[0]}')
+                module = importlib.import_module(parts[0])
+            evaluator_class = getattr(module, parts[-1])
+        _evaluator_classes[class_name] = evaluator_class
+    _logger.debug('Creating evaluator %s', evaluator_class.__name__)
+    return evaluator_class(config)
+
+
+def _walk_scandir(root):
+    """Generate the paths of the files within a directory recursively.
+
+    Relies on the directory entries returned by os.scandir to tell files
+    from directories, which avoids a stat call per entry on most
+    platforms. As with os.walk, symbolic links to files are followed but
+    those to directories are not, and directories that cannot be read
+    are skipped. Subdirectories are kept in an explicit stack rather
+    than recursed into, so deep trees need no nested generators; they
+    are pushed in reverse, so that files are visited in the same
+    top-down order as os.walk.
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            subdirectories = []
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        yield entry.path
+                    elif not entry.is_symlink():
+                        subdirectories.append(entry.path)
+            pending.extend(reversed(subdirectories))
+        except OSError as e:
+            _logger.warning(f'"{directory}" could not be read ({e}), '
+                            'skipping.')
 
 
 def _process_input(args):
     """Process an input argument, globbing files and directories."""
-    for arg in _flatten([glob.glob(file) for file in args]):
-        if os.path.exists(arg):
+    for pattern in args:
+        found = False
+        for arg in glob.iglob(pattern):
+            found = True
             if os.path.isfile(arg):
                 yield arg
             elif os.path.isdir(arg):
-                directory = os.walk(arg)
-                for adir in directory:
-                    base_dir = adir[0]
-                    for filename in adir[2]:
-                        yield os.path.join(base_dir, filename)
-            else:
+                yield from _walk_scandir(arg)
+            elif os.path.exists(arg):
                 _logger.warning(f'"{arg}" neither a file nor a directory, '
                                 'skipping.')
-        else:
-            _logger.warning(f'"{arg}" not found, skipping.')
+            else:
+                _logger.warning(f'"{arg}" not found, skipping.')
+        if not found:
+            _logger.warning(f'"{pattern}" not found, skipping.')
+
+
+def _create_evaluators(config_file, profile, substitutions):
+    """Load the configuration and create its evaluators."""
+    evaluators = []
+    _load_config(config_file, profile, substitutions)
+    if _config_evaluators:
+        for config in _config_evaluators:
+            evaluators.append(_create_evaluator(config))
+    return evaluators
+
+
+def _analyze_file(evaluators, src):
+    """Analyze a single source file with the given evaluators.
+
+    src is an item of the source_files argument of analyze().
+
+    Returns a FileReports object, or None if there were no reports.
+    """
+    intervals = None
+    if type(src) is str:
+        file_path = src
+        source_type = None
+    else:
+        file_path = src[0]
+        source_type = src[1]
+        if len(src) > 2:
+            intervals = src[2]
+    fr = FileReports(file_path, source_type=source_type)
+    # Shared by the top-level rules, so that the file is mapped once
+    ctx = FileContext(file_path)
+    try:
+        for ev in evaluators:
+            if ev.is_proxy:
+                ev.attach(file_path, source_type=source_type)
+            else:
+                if ev.applies_to_source_type(source_type):
+                    ev.reset()
+                else:
+                    _logger.debug(
+                        '- Evaluator: %s (not applicable for source type '
+                        '%s)', ev.__class__.__name__, source_type)
+                    continue
+            # Discard the intervals of any previously analyzed file
+            ev.clear_intervals()
+            if intervals:
+                for iv in intervals:
+                    ev.add_interval(iv[0], iv[1])
+            if ev.is_proxy:
+                ev_rep = ev.evaluate(exhaustive=True)
+            else:
+                # Only rules whose uses_file_context is true (e.g.,
+                # RegexRules without overrides) are given ctx
+                ev_rep = ev.evaluate_context(file_path, ctx)
+            _logger.debug('- Evaluator: %s (%d report(s))',
+                          ev.__class__.__name__, len(ev_rep))
+            fr.add_reports(ev_rep)
+    finally:
+        ctx.close()
+    return fr if fr.reports else None
+
+
+def _init_worker(config_file, profile, substitutions):
+    """Initialize a worker process with the analysis configuration."""
+    global _worker_config, _worker_evaluators
+    _worker_config = (config_file, profile, substitutions)
+    _worker_evaluators = None
+
+
+def _analyze_file_in_worker(src):
+    """Analyze a single source file in a worker process.
+
+    The evaluators are created on the first call, rather than by the
+    initializer so that configuration errors surface as such, and are
+    reused for every subsequent file analyzed by the same worker.
+
+    Returns a FileReports object, or None if there were no reports.
+    """
+    global _worker_evaluators
+    if _worker_evaluators is None:
+        _worker_evaluators = _create_evaluators(*_worker_config)
+    return _analyze_file(_worker_evaluators, src)
+
+
+def _analyze_parallel(source_files, config_file, profile, substitutions,
+                      exhaustive, jobs):
+    """Analyze the source files over a pool of worker processes.
+
+    Each worker loads the configuration and creates its own evaluators,
+    so no evaluator state is shared between processes. source_files can
+    be any iterable: only a few files per worker are submitted ahead of
+    time, so that files can be analyzed while the iterable is still
+    producing them. The FileReports are returned in the order of
+    source_files.
+
+    If not exhaustive, the files after the first one (in the order of
+    source_files) with errors are dropped, as in a serial analysis,
+    even if their workers finished first.
+    """
+    indexed_reports = []
+    error_index = None
+    sources = enumerate(source_files)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(config_file, profile,
+                                       substitutions)) as executor:
+
+        def submit(count):
+            for i, src in islice(sources, count):
+                future = executor.submit(_analyze_file_in_worker, src)
+                pending[future] = i
+
+        pending = {}
+        submit(jobs * 2)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                fr = future.result()
+                if fr is not None and (error_index is None
+                                       or i < error_index):
+                    indexed_reports.append((i, fr))
+                    _print_verbose(fr)
+                    if not exhaustive and fr.is_error:
+                        error_index = i
+            if error_index is None:
+                submit(len(done))
+            else:
+                # Only the files before the first error are still needed
+                for f, i in list(pending.items()):
+                    if i > error_index:
+                        f.cancel()
+                        del pending[f]
+    indexed_reports.sort(key=lambda ir: ir[0])
+    return [fr for i, fr in indexed_reports
+            if error_index is None or i <= error_index]
 
 
 # PUBLIC FUNCTIONS
@@ -722,10 +1506,11 @@ def get_user_config_directory(create_if_missing=True):
 
 
 def analyze(source_files, config_file, profile='default', substitutions=None,
-            exhaustive=True, verbose_output=False):
+            exhaustive=True, verbose_output=False, jobs=1):
     """Analyze the source code in the specified source files.
 
-    The source_files argument must be a list whose items are either:
+    The source_files argument must be an iterable (e.g., a list or a
+    generator) whose items are either:
     - strings representing paths to files
     - two-item tuples whose first item is a string representing the path
       to a file and the second item is an integer denoting the type of
@@ -736,54 +1521,35 @@ def analyze(source_files, config_file, profile='default', substitutions=None,
       the third item is a list of two-item tuples denoting intervals
       within which to limit the analysis
 
+    If jobs is greater than 1, the files are analyzed in parallel by up
+    to that many worker processes, each with its own evaluators (and,
+    for PeopleCode, its own parser caches). If jobs is None, one worker
+    process per CPU is used.
+
     Returns a list of FileReports objects.
     """
     global _verbose
     _verbose = verbose_output
+    if jobs is None:
+        jobs = os.cpu_count() or 1
     evaluators = []
-    if source_files:
-        _load_config(config_file, profile, substitutions)
-        if _config_evaluators:
-            for config in _config_evaluators:
-                evaluators.append(_create_evaluator(config))
+    # Peek at the first sources without consuming the whole iterable
+    sources = iter(source_files)
+    first_sources = list(islice(sources, 2))
+    if first_sources:
+        evaluators = _create_evaluators(config_file, profile, substitutions)
     if evaluators:
+        sources = chain(first_sources, sources)
+        if jobs > 1 and len(first_sources) > 1:
+            return _analyze_parallel(sources, config_file, profile,
+                                     substitutions, exhaustive, jobs)
         file_reports = []
-        for src in source_files:
-            intervals = None
-            if type(src) is str:
-                file_path = src
-                source_type = None
-            else:
-                file_path = src[0]
-                source_type = src[1]
-                if len(src) > 2:
-                    intervals = src[2]
-            reports = []
-            for ev in evaluators:
-                if intervals:
-                    for iv in intervals:
-                        ev.add_interval(iv[0], iv[1])
-                if ev.is_proxy:
-                    ev.attach(file_path, source_type=source_type)
-                else:
-                    if ev.applies_to_source_type(source_type):
-                        ev.reset()
-                    else:
-                        _logger.debug(
-                            f'- Evaluator: {ev.__class__.__name__} (not '
-                            f'applicable for source type {str(source_type)})')
-                        continue
-                ev_rep = ev.evaluate(file_path)
-                _logger.debug(f'- Evaluator: {ev.__class__.__name__} '
-                              f'({str(len(ev_rep))} report(s))')
-                reports.extend(ev_rep)
-            if reports:
-                fr = FileReports(file_path, source_type=source_type,
-                                 reports=reports)
+        for src in sources:
+            fr = _analyze_file(evaluators, src)
+            if fr is not None:
                 file_reports.append(fr)
-                status = fr.cumulative_status
                 _print_verbose(fr)
-                if not exhaustive and status == ReportType.ERROR:
+                if not exhaustive and fr.is_error:
                     break
             # else:
             #     _print_verbose(f'{os.path.basename(file_path)}: no reports')
@@ -795,8 +1561,8 @@ def analyze(source_files, config_file, profile='default', substitutions=None,
 
 
 if __name__ == '__main__':
-    assert sys.version_info >= (3, 6), \
-           'Python 3.6+ is required to run this script'
+    assert sys.version_info >= (3, 7), \
+           'Python 3.7+ is required to run this script'
     default_config_file_path = os.path.join(get_user_config_directory(),
                                             default_config_file_name)
     parser = argparse.ArgumentParser(
@@ -817,6 +1583,10 @@ if __name__ == '__main__':
         '-s', '--substitute', metavar='"VARIABLE=value"', action='append',
         help=('specify a variable substitution for the configuration profile '
               '(can be specified multiple times)'))
+    parser.add_argument(
+        '-j', '--jobs', metavar='N', type=int, default=1,
+        help=('the number of files to analyze in parallel, or 0 for one per '
+              'CPU (defaults to 1)'))
     parser.add_argument(
         'files', metavar='file_or_dir', nargs='+',
         help=('one or more source files or directories to process recursively '
@@ -847,9 +1617,12 @@ if __name__ == '__main__':
             _logger.info(f'substitutions = {substitutions}')
     else:
         substitutions = None
-    file_reports = analyze(list(_process_input(args.files)), args.configfile,
+    if args.jobs < 0:
+        parser.error(f'Invalid number of jobs: {args.jobs}')
+    file_reports = analyze(_process_input(args.files), args.configfile,
                            profile=args.profile, substitutions=substitutions,
-                           verbose_output=(args.verbosity > 0))
+                           verbose_output=(args.verbosity > 0),
+                           jobs=(args.jobs or None))
     for fr in file_reports:
         if fr.is_error:
             sys.exit(1)
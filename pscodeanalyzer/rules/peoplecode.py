@@ -1,14 +1,25 @@
 """Static code analyzer rules for PeopleCode."""
 
+import codecs
+import hashlib
 import logging
+import os
+import pickle
+import re
+import sys
+import tempfile
 from abc import ABC
 from collections import OrderedDict
 
-from antlr4 import CommonTokenStream, FileStream, ParseTreeWalker
+from antlr4 import (BailErrorStrategy, CommonTokenStream, InputStream,
+                    ParserRuleContext, ParseTreeWalker, PredictionMode)
+from antlr4.Token import CommonToken
 from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 
 from peoplecodeparser.PeopleCodeLexer import PeopleCodeLexer
-from peoplecodeparser.PeopleCodeParser import PeopleCodeParser
+from peoplecodeparser.PeopleCodeParser import PeopleCodeParser, serializedATN
 from peoplecodeparser.PeopleCodeParserListener import PeopleCodeParserListener
 
 from ..engine import Proxy, Report, Rule
@@ -16,6 +27,13 @@ from ..engine import Proxy, Report, Rule
 
 # GLOBAL VARIABLES
 _logger = logging.getLogger('peoplecode')
+# ParseTreeWalker is stateless, so a single instance is shared
+_walker = ParseTreeWalker.DEFAULT
+# Identifies the grammar in the keys of cached parse trees
+_grammar_fingerprint = None
+# Parse trees and syntax errors kept in memory, in LRU order, in one
+# cache per tree_cache_size so that each size limit is kept
+_tree_caches = {}
 
 
 # PARSER INFRASTRUCTURE CLASSES
@@ -32,12 +50,177 @@ class ReportingErrorListener(ErrorListener):
 
     def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
         """Handle a syntax error."""
-        _logger.debug(f'Syntax error at {line},{column + 1}: {msg}')
+        _logger.debug('Syntax error at %d,%d: %s', line, column + 1, msg)
         report = Report('PeopleCodeParser', msg, line=line,
                         column=(column + 1))
         self.reports.append(report)
 
 
+class CompositeListener(PeopleCodeParserListener):
+    """A listener that forwards every event to several child listeners.
+
+    It allows several listeners to be run with a single walk of the
+    parse tree. A child that raises NotApplicableError is excluded from
+    the rest of the walk, and is added to not_applicable.
+    """
+
+    def __init__(self, listeners):
+        """Initialize the composite listener."""
+        super(CompositeListener, self).__init__()
+        self.listeners = list(listeners)
+        self.not_applicable = []
+
+    def _discard(self, listener, e):
+        """Exclude a listener that is not applicable to the input."""
+        _logger.debug('%s:%s', listener.__class__.__name__, e)
+        self.listeners.remove(listener)
+        self.not_applicable.append(listener)
+
+    def visitTerminal(self, node):
+        """Forward the event to the child listeners."""
+        for listener in tuple(self.listeners):
+            try:
+                listener.visitTerminal(node)
+            except NotApplicableError as e:
+                self._discard(listener, e)
+
+    def visitErrorNode(self, node):
+        """Forward the event to the child listeners."""
+        for listener in tuple(self.listeners):
+            try:
+                listener.visitErrorNode(node)
+            except NotApplicableError as e:
+                self._discard(listener, e)
+
+    def enterEveryRule(self, ctx):
+        """Forward the generic and specific events to the children."""
+        for listener in tuple(self.listeners):
+            try:
+                listener.enterEveryRule(ctx)
+                ctx.enterRule(listener)
+            except NotApplicableError as e:
+                self._discard(listener, e)
+
+    def exitEveryRule(self, ctx):
+        """Forward the specific and generic events to the children."""
+        for listener in tuple(self.listeners):
+            try:
+                ctx.exitRule(listener)
+                listener.exitEveryRule(ctx)
+            except NotApplicableError as e:
+                self._discard(listener, e)
+
+
+class DispatchWalker:
+    """A parse tree walker that only dispatches the handled events.
+
+    ParseTreeWalker fires the generic and the specific enter and exit
+    events at every node, and an event at every terminal, for every
+    listener. This walker instead calls only the enter and exit methods
+    that each listener class overrides, looked up once by context type,
+    and it walks the tree iteratively. Hence, it only supports listeners
+    that handle none of the generic events.
+    """
+
+    _generic_events = ('enterEveryRule', 'exitEveryRule', 'visitTerminal',
+                       'visitErrorNode')
+    _event_names = None
+    _handler_cache = {}
+
+    @staticmethod
+    def _get_override(listener_class, name):
+        """Return the listener class's method if it is overridden."""
+        method = getattr(listener_class, name)
+        if method is getattr(PeopleCodeParserListener, name):
+            return None
+        return method
+
+    @classmethod
+    def supports(cls, listener):
+        """Return True if the listener handles no generic events."""
+        return all(cls._get_override(type(listener), name) is None
+                   for name in cls._generic_events)
+
+    @classmethod
+    def _get_event_names(cls):
+        """Map each context class to its enter and exit method names."""
+        if cls._event_names is None:
+            names = {}
+            for ctx_class in vars(PeopleCodeParser).values():
+                if (isinstance(ctx_class, type)
+                        and issubclass(ctx_class, ParserRuleContext)
+                        and 'enterRule' in vars(ctx_class)):
+                    # The generated listener methods are named after the
+                    # rule or label, e.g. ProgramContext -> enterProgram
+                    rule_name = ctx_class.__name__[:-len('Context')]
+                    rule_name = rule_name[0].upper() + rule_name[1:]
+                    names[ctx_class] = (f'enter{rule_name}',
+                                        f'exit{rule_name}')
+            cls._event_names = names
+        return cls._event_names
+
+    @classmethod
+    def _get_handlers(cls, listener_class):
+        """Return the overridden enter and exit methods by context class.
+
+        Either of the methods is None if it is not overridden.
+        """
+        handlers = cls._handler_cache.get(listener_class)
+        if handlers is None:
+            handlers = {}
+            for ctx_class, (enter_name, exit_name) in \
+                    cls._get_event_names().items():
+                enter = cls._get_override(listener_class, enter_name)
+                exit_ = cls._get_override(listener_class, exit_name)
+                if enter is not None or exit_ is not None:
+                    handlers[ctx_class] = (enter, exit_)
+            cls._handler_cache[listener_class] = handlers
+        return handlers
+
+    @classmethod
+    def walk(cls, listeners, tree):
+        """Walk the tree for the listeners in a single pass.
+
+        A listener that raises NotApplicableError is excluded from the
+        rest of the walk. The list of such listeners is returned.
+        """
+        enters = {}
+        exits = {}
+        for listener in listeners:
+            for ctx_class, (enter, exit_) in cls._get_handlers(
+                    type(listener)).items():
+                if enter is not None:
+                    enters.setdefault(ctx_class, []).append(
+                        (listener, enter))
+                if exit_ is not None:
+                    exits.setdefault(ctx_class, []).append(
+                        (listener, exit_))
+        not_applicable = []
+        stack = [(tree, False)]
+        while stack:
+            node, exiting = stack.pop()
+            node_class = type(node)
+            handlers = (exits if exiting else enters).get(node_class)
+            if handlers:
+                for listener, method in handlers:
+                    if listener in not_applicable:
+                        continue
+                    try:
+                        method(listener, node)
+                    except NotApplicableError as e:
+                        _logger.debug('%s:%s', listener.__class__.__name__,
+                                      e)
+                        not_applicable.append(listener)
+            if not exiting:
+                if node_class in exits:
+                    stack.append((node, True))
+                if node.children:
+                    stack.extend([(child, False)
+                                  for child in reversed(node.children)
+                                  if isinstance(child, ParserRuleContext)])
+        return not_applicable
+
+
 # PROXIES
 class PeopleCodeParserProxy(Proxy):
     """Proxy class for rules that require the PeopleCode parser.
@@ -50,6 +233,19 @@ class PeopleCodeParserProxy(Proxy):
     The following configuration options apply:
     - "encoding": the encoding with which to open the source files
       (optional, defaults to "utf-8")
+    - "prefilter": indicates whether a file may be left unparsed when
+      the sentinels of its rules rule out any reports, in which case
+      syntax errors in that file go unreported (optional, defaults to
+      False)
+    - "cache_dir": a directory in which to keep the parse trees of the
+      files without syntax errors, keyed by a hash of their contents,
+      for reuse in later runs (optional, defaults to no caching); since
+      the trees are pickled, no one untrusted should be able to write
+      to it
+    - "tree_cache_size": the number of parse trees to keep in memory,
+      shared by all the PeopleCode proxies of the process with the same
+      tree_cache_size, so that a file analyzed again (e.g., by another
+      proxy) is not parsed again (optional, defaults to 0)
     """
 
     def __init__(self, config):
@@ -59,35 +255,67 @@ class PeopleCodeParserProxy(Proxy):
         """
         super(PeopleCodeParserProxy, self).__init__(config)
         self.encoding = config.get('encoding', 'utf-8')
+        self._is_utf8 = codecs.lookup(self.encoding).name == 'utf-8'
+        self._is_ascii_compatible = _is_ascii_compatible(self.encoding)
+        self.prefilter = config.get('prefilter', False)
+        self.cache_dir = config.get('cache_dir')
+        self.tree_cache_size = config.get('tree_cache_size', 0)
+        if self.tree_cache_size:
+            self._tree_cache = _tree_caches.setdefault(
+                self.tree_cache_size, OrderedDict())
+        else:
+            self._tree_cache = None
+        # The lexer, parser and error listener are reused across files
+        self._lexer = None
+        self._parser = None
+        self.parse_reports = []
+        self._error_listener = ReportingErrorListener(self.parse_reports)
 
     def reset(self):
         """Reset the proxy for a new source."""
         super(PeopleCodeParserProxy, self).reset()
         self.parse_reports = []
+        self._error_listener.reports = self.parse_reports
         self.starting_rule = 'appClass' if self.source_type == 58 \
             or (self.source_type is None
                 and self.file_path
                 and '058-' in self.file_path) else 'program'
         self._file_stream = None
-        self._lexer = None
         self._token_stream = None
-        self._parser = None
         self._parse_tree = None
-        self._walker = None
+        self._walked_rules = set()
+        self._not_applicable = set()
 
     @property
     def file_stream(self):
-        """Lazy initialization of file_stream."""
+        """Lazy initialization of file_stream.
+
+        The source is decoded straight from the memory-mapped contents
+        of the file context, so the file is neither opened nor copied
+        again. A UTF-8 byte order mark, if present, is skipped.
+        """
         if self._file_stream is None:
-            self._file_stream = FileStream(self.file_path,
-                                           encoding=self.encoding)
+            contents = self.file_context.contents
+            skip = 0
+            if (self._is_utf8
+                    and contents[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8):
+                skip = len(codecs.BOM_UTF8)
+            with memoryview(contents) as view, view[skip:] as text:
+                data = codecs.decode(text, self.encoding)
+            self._file_stream = InputStream(data)
         return self._file_stream
 
     @property
     def lexer(self):
-        """Lazy initialization of lexer."""
+        """Lazy initialization of lexer.
+
+        The lexer is created once, and subsequently pointed to the
+        file_stream of each new source.
+        """
         if self._lexer is None:
             self._lexer = PeopleCodeLexer(self.file_stream)
+        elif self._lexer.inputStream is not self.file_stream:
+            self._lexer.inputStream = self.file_stream
         return self._lexer
 
     @property
@@ -99,31 +327,131 @@ class PeopleCodeParserProxy(Proxy):
 
     @property
     def parser(self):
-        """Lazy initialization of parser."""
+        """Lazy initialization of parser.
+
+        The parser is created once, and subsequently pointed to the
+        token_stream of each new source. Its errors are reported through
+        the error listener into parse_reports.
+        """
         if self._parser is None:
             self._parser = PeopleCodeParser(self.token_stream)
-        self._parser.removeErrorListeners()
-        self.parse_reports = []
-        listener = ReportingErrorListener(self.parse_reports)
-        self._parser.addErrorListener(listener)
+            self._parser.removeErrorListeners()
+            self._parser.addErrorListener(self._error_listener)
+        elif self._parser.getTokenStream() is not self.token_stream:
+            self._parser.setTokenStream(self.token_stream)
         return self._parser
 
     @property
     def parse_tree(self):
-        """Lazy initialization of parse_tree."""
+        """Lazy initialization of parse_tree.
+
+        The tree is looked up in the in-memory cache first, then in the
+        cache directory (if either is configured), and only parsed
+        when not found. It is then added to the caches.
+        """
         if self._parse_tree is None:
-            _logger.info(f'{self.__class__.__name__}:Parsing file '
-                         f'"{self.file_path}"...')
-            self._parse_tree = getattr(self.parser, self.starting_rule)()
-            _logger.info(f'{self.__class__.__name__}:Parsing complete')
+            if self.cache_dir or self.tree_cache_size:
+                cache_key = self._get_cache_key()
+            else:
+                cache_key = None
+            if self.tree_cache_size:
+                cached = self._tree_cache.get(cache_key)
+                if cached is not None:
+                    self._tree_cache.move_to_end(cache_key)
+                    self._parse_tree, parse_reports = cached
+                    self.parse_reports.extend(parse_reports)
+                    return self._parse_tree
+            if self.cache_dir:
+                cache_path = os.path.join(self.cache_dir,
+                                          f'{cache_key}.pickle')
+                self._parse_tree = self._load_cached_tree(cache_path)
+            if self._parse_tree is None:
+                self._parse_tree = self._parse()
+                if self.cache_dir and not self.parse_reports:
+                    self._store_cached_tree(cache_path, self._parse_tree)
+            if self.tree_cache_size:
+                self._tree_cache[cache_key] = (self._parse_tree,
+                                               tuple(self.parse_reports))
+                while len(self._tree_cache) > self.tree_cache_size:
+                    self._tree_cache.popitem(last=False)
         return self._parse_tree
 
-    @property
-    def walker(self):
-        """Lazy initialization of walker."""
-        if self._walker is None:
-            self._walker = ParseTreeWalker()
-        return self._walker
+    def _parse(self):
+        """Parse the file, returning the parse tree.
+
+        Parsing is attempted first with the faster SLL prediction mode,
+        bailing out at the first syntax error. Only if that fails is the
+        file parsed again with full LL prediction and the default error
+        recovery, which also reports the syntax errors.
+        """
+        _logger.info(f'{self.__class__.__name__}:Parsing file '
+                     f'"{self.file_path}"...')
+        parser = self.parser
+        start_rule = getattr(parser, self.starting_rule)
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        try:
+            tree = start_rule()
+        except ParseCancellationException:
+            _logger.info(f'{self.__class__.__name__}:SLL parsing '
+                         'failed, retrying with LL')
+            # Discard any reports from the first attempt
+            self.parse_reports.clear()
+            parser._interp.predictionMode = PredictionMode.LL
+            parser._errHandler = DefaultErrorStrategy()
+            parser.reset()
+            tree = start_rule()
+        _logger.info(f'{self.__class__.__name__}:Parsing complete')
+        return tree
+
+    def _get_cache_key(self):
+        """Return the key of the file's parse tree in the caches.
+
+        The key covers everything the tree depends on: the grammar, the
+        starting rule, the encoding and the contents of the file.
+        """
+        digest = hashlib.sha256(_get_grammar_fingerprint())
+        digest.update(f'\0{self.starting_rule}\0{self.encoding}\0'.encode())
+        digest.update(self.file_context.contents)
+        return digest.hexdigest()
+
+    def _load_cached_tree(self, cache_path):
+        """Return the cached parse tree, or None if not available."""
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                tree = pickle.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError) as e:
+            _logger.warning(f'Ignoring unreadable cached parse tree '
+                            f'"{cache_path}": {e}')
+            return None
+        _logger.info(f'{self.__class__.__name__}:Parse tree of '
+                     f'"{self.file_path}" loaded from the cache')
+        return tree
+
+    def _store_cached_tree(self, cache_path, tree):
+        """Store the parse tree in the cache.
+
+        The file is written under a temporary name and then renamed, so
+        that concurrent analyses never read a partial tree.
+        """
+        _detach_tree(tree)
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir,
+                                             suffix='.tmp',
+                                             delete=False) as temp_file:
+                temp_path = temp_file.name
+                pickle.dump(tree, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except (OSError, RecursionError, pickle.PicklingError) as e:
+            _logger.warning(f'Parse tree of "{self.file_path}" not cached: '
+                            f'{e}')
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
 
     def _propagate_state(self, previous_ev, current_ev):
         """Copy the annotations between subsequent evaluators."""
@@ -132,20 +460,88 @@ class PeopleCodeParserProxy(Proxy):
             if current_ev.inherit_annotations:
                 current_ev.annotations = previous_ev.annotations
 
-    def _evaluate_rule(self, rule):
-        """Evaluate a rule, returning its reports."""
+    def _fusable_rules(self, rule):
+        """Return the rules that can share a tree walk with rule.
+
+        These are rule itself and the applicable listener rules that
+        follow it, up to the next proxy or the next rule that inherits
+        annotations, since the latter depends on a completed walk.
+        """
+        rules = [rule]
+        index = self.evaluators.index(rule)
+        for ev in self.evaluators[index + 1:]:
+            if (ev.is_proxy
+                    or not isinstance(ev, PeopleCodeParserListenerRule)
+                    or ev.inherit_annotations):
+                break
+            if ev.applies_to_source_type(self.source_type):
+                rules.append(ev)
+        return rules
+
+    def _may_report(self, rule):
+        """Return False if the rule's sentinel is absent from the file.
+
+        Sentinels are only searched for in files whose encoding leaves
+        ASCII text unchanged, and are ignored for rules whose
+        annotations the next rule inherits, since those must be built
+        for every file.
+        """
+        if (rule.sentinel is None or not self._is_ascii_compatible
+                or self._is_inherited(rule)):
+            return True
+        return rule.sentinel.search(self.file_context.contents) is not None
+
+    def _is_inherited(self, rule):
+        """Return True if the next evaluator inherits rule's annotations."""
+        index = self.evaluators.index(rule) + 1
+        if index < len(self.evaluators):
+            next_ev = self.evaluators[index]
+            return (isinstance(next_ev, PeopleCodeParserListenerRule)
+                    and next_ev.inherit_annotations)
+        return False
+
+    def _walk_rules(self, rules):
+        """Walk the parse tree once for all of the given rules.
+
+        Rules that cannot report anything for this file, according to
+        their sentinels, are not run.
+        """
+        self._walked_rules.update(rules)
+        rules = [r for r in rules if self._may_report(r)]
+        if not rules:
+            if not self.prefilter:
+                # Parse anyway, so that syntax errors are reported
+                self.parse_tree
+            return
         tree = self.parse_tree
-        walker = self.walker
-        try:
-            walker.walk(rule, tree)
-            return rule.evaluate()
-        except NotApplicableError as e:
-            _logger.debug(f'{self.__class__.__name__}:{str(e)}')
+        if all(DispatchWalker.supports(r) for r in rules):
+            self._not_applicable.update(DispatchWalker.walk(rules, tree))
+        elif len(rules) == 1:
+            try:
+                _walker.walk(rules[0], tree)
+            except NotApplicableError as e:
+                _logger.debug('%s:%s', self.__class__.__name__, e)
+                self._not_applicable.add(rules[0])
+        else:
+            composite = CompositeListener(rules)
+            _walker.walk(composite, tree)
+            self._not_applicable.update(composite.not_applicable)
+
+    def _evaluate_rule(self, rule):
+        """Evaluate a rule, returning its reports.
+
+        The first rule of a fusable group triggers a single walk of the
+        parse tree for the whole group.
+        """
+        if rule not in self._walked_rules:
+            self._walk_rules(self._fusable_rules(rule))
+        if rule in self._not_applicable:
             return []
+        return rule.evaluate()
 
     def evaluate(self, exhaustive=False):
         """Extend the superclass's evaluation results with any errors."""
-        _logger.debug(f'Evaluating {self.__class__.__name__}')
+        _logger.debug('Evaluating %s', self.__class__.__name__)
         super_reports = super(PeopleCodeParserProxy, self).evaluate(
             exhaustive=exhaustive)
         all_reports = self.parse_reports + super_reports
@@ -160,8 +556,14 @@ class PeopleCodeParserListenerRule(Rule, PeopleCodeParserListener):
     - "inherit_annotations": indicates whether this rule should inherit
       the annotations from the rule that ran before it (optional,
       defaults to False)
+
+    Subclasses may set sentinel to a compiled bytes regex of ASCII text
+    that must be found in a file for the rule to report anything; the
+    tree is not walked for the rule in files where it is absent.
     """
 
+    sentinel = None
+
     def __init__(self, config):
         """Initialize the rule.
 
@@ -180,13 +582,15 @@ class PeopleCodeParserListenerRule(Rule, PeopleCodeParserListener):
 
     def evaluate(self, source=None):
         """Return the list of Report objects generated by the rule."""
-        _logger.debug(f'Evaluating {self.__class__.__name__}')
+        _logger.debug('Evaluating %s', self.__class__.__name__)
         return self.reports
 
 
 class SQLExecRule(PeopleCodeParserListenerRule):
     """Rule to check for SQLExec calls with literal SQL statements."""
 
+    sentinel = re.compile(rb'(?i)\bSQLExec\b')
+
     def __init__(self, config):
         """Initialize the rule."""
         super(SQLExecRule, self).__init__(config)
@@ -195,37 +599,40 @@ class SQLExecRule(PeopleCodeParserListenerRule):
     def enterSimpleFunctionCall(
             self, ctx: PeopleCodeParser.SimpleFunctionCallContext):
         """Event triggered when a simple function call is found."""
-        line = ctx.start.line
+        function_name = ctx.genericID().allowableFunctionName()
+        if not (function_name
+                and function_name.getText().upper() == 'SQLEXEC'):
+            return
+        start = ctx.start
+        line = start.line
         if self.is_position_in_intervals(line):
-            function_name = ctx.genericID().allowableFunctionName()
-            if function_name and function_name.getText().upper() == 'SQLEXEC':
-                args = ctx.functionCallArguments()
-                if args:
-                    expr = args.expression(i=0)
-                    if hasattr(expr, 'literal'):
-                        message = 'SQLExec with literal first argument'
-                    elif hasattr(expr, 'PIPE'):
-                        message = 'SQLExec with concatenated first argument'
-                    else:
-                        message = None
-                    if message:
-                        report = Report(
-                            self.code, message,
-                            line=line, column=(ctx.start.column + 1),
-                            text=ctx.getText(),
-                            detail=('The first argument to SQLExec should be '
-                                    'either a SQL object reference or a '
-                                    'variable with dynamically generated '
-                                    'SQL.'))
-                        self.reports.append(report)
+            args = ctx.functionCallArguments()
+            if args:
+                expr = args.expression(i=0)
+                if isinstance(expr, PeopleCodeParser.LiteralExprContext):
+                    message = 'SQLExec with literal first argument'
+                elif isinstance(expr,
+                                PeopleCodeParser.ConcatenationExprContext):
+                    message = 'SQLExec with concatenated first argument'
                 else:
-                    # Should never happen in valid PeopleCode
+                    message = None
+                if message:
                     report = Report(
-                        self.code, 'SQLExec with no arguments', line=line,
-                        column=(ctx.start.column + 1), text=ctx.getText(),
-                        detail=('SQLExec should not be called without '
-                                'arguments.'))
+                        self.code, message,
+                        line=line, column=(start.column + 1),
+                        text=ctx.getText(),
+                        detail=('The first argument to SQLExec should be '
+                                'either a SQL object reference or a '
+                                'variable with dynamically generated SQL.'))
                     self.reports.append(report)
+            else:
+                # Should never happen in valid PeopleCode
+                report = Report(
+                    self.code, 'SQLExec with no arguments', line=line,
+                    column=(start.column + 1), text=ctx.getText(),
+                    detail=('SQLExec should not be called without '
+                            'arguments.'))
+                self.reports.append(report)
 
 
 # SYMBOL RESOLUTION CLASSES
@@ -257,9 +664,16 @@ class SymbolDefinitionPhaseRule(PeopleCodeParserListenerRule):
 
     def _define_variable(self, token):
         """Define a variable or argument in the current scope."""
-        var = VariableSymbol(token.getText(), token.getSourceInterval()[0])
+        symbol = token.symbol
+        var = VariableSymbol(symbol.text, symbol.tokenIndex)
         self.current_scope.define(var)
 
+    def _define_variables(self, tokens):
+        """Define several variables in the current scope at once."""
+        self.current_scope.define_all(
+            VariableSymbol(token.symbol.text, token.symbol.tokenIndex)
+            for token in tokens)
+
     def _pop_scope(self):
         """Pop the scope."""
         self._log_current_scope()
@@ -279,9 +693,9 @@ class SymbolDefinitionPhaseRule(PeopleCodeParserListenerRule):
 
         Application Classes should not be subjected to this listener.
         """
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#AppClassProgram@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #AppClassProgram@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         raise NotApplicableError('This listener should not be used for '
                                  'Application Classes')
 
@@ -292,17 +706,18 @@ class SymbolDefinitionPhaseRule(PeopleCodeParserListenerRule):
 
         Application Classes should not be subjected to this listener.
         """
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#InterfaceProgram@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #InterfaceProgram@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         raise NotApplicableError('This listener should not be used for '
                                  'Application Classes')
 
     # Enter a parse tree produced by PeopleCodeParser#program.
     def enterProgram(self, ctx: PeopleCodeParser.ProgramContext):
         """Initialize the scoping mechanism."""
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#program@{ctx.start.line},{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #program@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         self.annotations = {}
         self.current_scope = GlobalScope()
         # Annotate the root node with the global scope for the
@@ -313,9 +728,9 @@ class SymbolDefinitionPhaseRule(PeopleCodeParserListenerRule):
     def enterFunctionDefinition(
             self, ctx: PeopleCodeParser.FunctionDefinitionContext):
         """Start a new function scope."""
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#functionDefinition@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #functionDefinition@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         name = ctx.allowableFunctionName().getText()
         scope = FunctionScope(name, self.current_scope)
         self.current_scope = scope
@@ -325,18 +740,18 @@ class SymbolDefinitionPhaseRule(PeopleCodeParserListenerRule):
     def exitFunctionArgument(
             self, ctx: PeopleCodeParser.FunctionArgumentContext):
         """Add a function argument to the current scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#functionArgument@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #functionArgument@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._define_variable(ctx.USER_VARIABLE())
 
     # Exit a parse tree produced by PeopleCodeParser#functionDefinition.
     def exitFunctionDefinition(
             self, ctx: PeopleCodeParser.FunctionDefinitionContext):
         """Pop the scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#functionDefinition@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #functionDefinition@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._pop_scope()
 
     # Exit a parse tree produced by PeopleCodeParser#nonLocalVarDeclaration.
@@ -346,51 +761,49 @@ class SymbolDefinitionPhaseRule(PeopleCodeParserListenerRule):
 
         The current scope should be the global scope.
         """
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#nonLocalVarDeclaration@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #nonLocalVarDeclaration@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         var_tokens = ctx.USER_VARIABLE()
         if var_tokens:
-            for var in var_tokens:
-                self._define_variable(var)
+            self._define_variables(var_tokens)
 
     # Exit a parse tree produced by PeopleCodeParser#localVariableDefinition.
     def exitLocalVariableDefinition(
             self, ctx: PeopleCodeParser.LocalVariableDefinitionContext):
         """Add local variables to the current scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#localVariableDefinition@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #localVariableDefinition@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         var_tokens = ctx.USER_VARIABLE()
         if var_tokens:
-            for var in var_tokens:
-                self._define_variable(var)
+            self._define_variables(var_tokens)
 
     # Exit a parse tree produced by
     # PeopleCodeParser#localVariableDeclAssignment.
     def exitLocalVariableDeclAssignment(
             self, ctx: PeopleCodeParser.LocalVariableDeclAssignmentContext):
         """Add a local variable to the current scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#localVariableDeclAssignment@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #localVariableDeclAssignment@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._define_variable(ctx.USER_VARIABLE())
 
     # Exit a parse tree produced by PeopleCodeParser#constantDeclaration.
     def exitConstantDeclaration(
             self, ctx: PeopleCodeParser.ConstantDeclarationContext):
         """Add a constant to the current scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#constantDeclaration@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #constantDeclaration@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._define_variable(ctx.USER_VARIABLE())
 
     # Enter a parse tree produced by PeopleCodeParser#statementBlock.
     def enterStatementBlock(self, ctx: PeopleCodeParser.StatementBlockContext):
         """Push a new local scope into the stack."""
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#statementBlock@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #statementBlock@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         scope = LocalScope(f'local@{ctx.start.line},{ctx.start.column + 1}',
                            self.current_scope)
         self.current_scope = scope
@@ -399,15 +812,17 @@ class SymbolDefinitionPhaseRule(PeopleCodeParserListenerRule):
     # Exit a parse tree produced by PeopleCodeParser#statementBlock.
     def exitStatementBlock(self, ctx: PeopleCodeParser.StatementBlockContext):
         """Pops the scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#statementBlock@{ctx.stop.line},{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #statementBlock@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._pop_scope()
 
     # Exit a parse tree produced by PeopleCodeParser#program.
     def exitProgram(self, ctx: PeopleCodeParser.ProgramContext):
         """Signifies the end of the parse."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#program@{ctx.stop.line},{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #program@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._log_current_scope()
 
 
@@ -473,9 +888,9 @@ class SymbolReferencePhaseRule(PeopleCodeParserListenerRule):
 
         Application Classes should not be subjected to this listener.
         """
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#AppClassProgram@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #AppClassProgram@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         raise NotApplicableError('This listener should not be used for '
                                  'Application Classes')
 
@@ -486,50 +901,52 @@ class SymbolReferencePhaseRule(PeopleCodeParserListenerRule):
 
         Application Classes should not be subjected to this listener.
         """
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#InterfaceProgram@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #InterfaceProgram@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         raise NotApplicableError('This listener should not be used for '
                                  'Application Classes')
 
     # Enter a parse tree produced by PeopleCodeParser#program.
     def enterProgram(self, ctx: PeopleCodeParser.ProgramContext):
         """Set the global scope."""
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#program@{ctx.start.line},{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #program@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         self._set_current_scope(ctx)
 
     # Enter a parse tree produced by PeopleCodeParser#functionDefinition.
     def enterFunctionDefinition(
             self, ctx: PeopleCodeParser.FunctionDefinitionContext):
         """Set the function scope."""
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#functionDefinition@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #functionDefinition@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         self._set_current_scope(ctx)
 
     # Exit a parse tree produced by PeopleCodeParser#functionDefinition.
     def exitFunctionDefinition(
             self, ctx: PeopleCodeParser.FunctionDefinitionContext):
         """Pop the scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#functionDefinition@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #functionDefinition@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._pop_scope()
 
     # Enter a parse tree produced by PeopleCodeParser#statementBlock.
     def enterStatementBlock(self, ctx: PeopleCodeParser.StatementBlockContext):
         """Set the local scope."""
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#statementBlock@{ctx.start.line},'
-                      f'{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #statementBlock@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         self._set_current_scope(ctx)
 
     # Exit a parse tree produced by PeopleCodeParser#statementBlock.
     def exitStatementBlock(self, ctx: PeopleCodeParser.StatementBlockContext):
         """Pop the scope."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#statementBlock@{ctx.stop.line},{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #statementBlock@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._pop_scope()
 
     # Enter a parse tree produced by PeopleCodeParser#forStatement.
@@ -538,24 +955,26 @@ class SymbolReferencePhaseRule(PeopleCodeParserListenerRule):
 
         The goal is to resolve its index variable.
         """
-        _logger.debug(f'{self.__class__.__name__}:>>> '
-                      f'#forStatement@{ctx.start.line},{ctx.start.column + 1}')
+        _logger.debug('%s:>>> #forStatement@%d,%d',
+                      self.__class__.__name__, ctx.start.line,
+                      ctx.start.column + 1)
         self._resolve_variable(ctx.USER_VARIABLE())
 
     # Exit a parse tree produced by PeopleCodeParser#IdentUserVariable.
     def exitIdentUserVariable(
             self, ctx: PeopleCodeParser.IdentUserVariableContext):
         """Event triggered when a user variable is encountered."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#IdentUserVariable@{ctx.stop.line},'
-                      f'{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #IdentUserVariable@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
         self._resolve_variable(ctx.USER_VARIABLE())
 
     # Exit a parse tree produced by PeopleCodeParser#program.
     def exitProgram(self, ctx: PeopleCodeParser.ProgramContext):
         """Signify the end of the parse."""
-        _logger.debug(f'{self.__class__.__name__}:<<< '
-                      f'#program@{ctx.stop.line},{ctx.stop.column + 1}')
+        _logger.debug('%s:<<< #program@%d,%d',
+                      self.__class__.__name__, ctx.stop.line,
+                      ctx.stop.column + 1)
 
 
 class Scope(ABC):
@@ -565,6 +984,8 @@ class Scope(ABC):
     be instantiated directly.
     """
 
+    __slots__ = ('name', 'parent_scope', '_symbols')
+
     def __init__(self, name, parent_scope):
         """Initialize the scope.
 
@@ -580,19 +1001,32 @@ class Scope(ABC):
                 f'{str([s.name for s in self.symbols.values()])}')
 
     def resolve(self, name):
-        """Resolve a symbol by name."""
+        """Resolve a symbol by name in this scope or its ancestors."""
         search_name = name.lower()
-        s = self.symbols.get(search_name)
-        if s is None:
-            # Not found in this scope; check parent scope recursively
-            if self.parent_scope:
-                s = self.parent_scope.resolve(search_name)
-        return s
+        scope = self
+        while scope is not None:
+            s = scope.symbols.get(search_name)
+            if s is not None:
+                return s
+            scope = scope.parent_scope
+        return None
 
     def define(self, symbol):
-        """Define a symbol in this scope."""
+        """Define a symbol in this scope.
+
+        Names are case-insensitive, and their lowercased forms are
+        interned so that all scopes share a single copy of each.
+        """
         symbol.scope = self
-        self.symbols[symbol.name.lower()] = symbol
+        self.symbols[sys.intern(symbol.name.lower())] = symbol
+
+    def define_all(self, symbols):
+        """Define several symbols in this scope with a single update."""
+        new_symbols = {sys.intern(symbol.name.lower()): symbol
+                       for symbol in symbols}
+        for symbol in new_symbols.values():
+            symbol.scope = self
+        self.symbols.update(new_symbols)
 
     @property
     def symbols(self):
@@ -617,6 +1051,8 @@ class Scope(ABC):
 class GlobalScope(Scope):
     """The global scope."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the scope."""
         super(GlobalScope, self).__init__('global', None)
@@ -625,6 +1061,8 @@ class GlobalScope(Scope):
 class LocalScope(Scope):
     """A local scope."""
 
+    __slots__ = ()
+
     def __init__(self, name, parent_scope):
         """Initialize the scope."""
         super(LocalScope, self).__init__(name, parent_scope)
@@ -633,6 +1071,8 @@ class LocalScope(Scope):
 class Symbol:
     """Base class for symbols."""
 
+    __slots__ = ('name', 'index', 'scope')
+
     def __init__(self, name, index):
         """Initialize the symbol."""
         self.name = name
@@ -647,6 +1087,8 @@ class Symbol:
 class VariableSymbol(Symbol):
     """A symbol denoting a variable."""
 
+    __slots__ = ()
+
     def __init__(self, name, index):
         """Initialize the symbol."""
         super(VariableSymbol, self).__init__(name, index)
@@ -655,12 +1097,59 @@ class VariableSymbol(Symbol):
 class FunctionScope(Scope):
     """A scoped symbol representing a function."""
 
+    __slots__ = ('_arguments',)
+
     def __init__(self, name, parent_scope):
         """Initialize the scoped symbol."""
         super(FunctionScope, self).__init__(name, parent_scope)
-        self._arguments = OrderedDict()
+        self._arguments = {}
 
     @property
     def symbols(self):
         """Return the scope's symbols."""
         return self._arguments
+
+
+# PRIVATE FUNCTIONS
+def _get_grammar_fingerprint():
+    """Return a digest identifying the PeopleCode grammar."""
+    global _grammar_fingerprint
+    if _grammar_fingerprint is None:
+        _grammar_fingerprint = hashlib.sha256(
+            repr(serializedATN()).encode()).digest()
+    return _grammar_fingerprint
+
+
+def _is_ascii_compatible(encoding):
+    """Return True if ASCII text is encoded as itself in encoding."""
+    ascii_bytes = bytes(range(128))
+    try:
+        return codecs.decode(ascii_bytes, encoding) == ascii_bytes.decode()
+    except UnicodeDecodeError:
+        return False
+
+
+def _detach_token(token):
+    """Detach a token from its lexer and input stream."""
+    if token is not None and token.source is not CommonToken.EMPTY_SOURCE:
+        # The text would otherwise be read from the input stream
+        token.text = token.text
+        token.source = CommonToken.EMPTY_SOURCE
+
+
+def _detach_tree(tree):
+    """Detach a parse tree from the parser and input, for pickling.
+
+    The tree remains usable by listeners.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ParserRuleContext):
+            node.parser = None
+            _detach_token(node.start)
+            _detach_token(node.stop)
+            if node.children:
+                stack.extend(node.children)
+        else:
+            _detach_token(node.symbol)
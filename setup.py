@@ -14,7 +14,7 @@ setup(
     description='A static code analyzer with configurable plug-in rules',
     long_description=long_description,
     long_description_content_type='text/markdown',
-    python_requires='~=3.6',
+    python_requires='~=3.7',
     author='Leandro Baca',
     author_email='leandrobaca77@gmail.com',
     url='https://github.com/lbaca/PSCodeAnalyzer',
@@ -26,7 +26,6 @@ setup(
         'Intended Audience :: Developers',
         'Intended Audience :: Information Technology',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -1,11 +1,15 @@
 """Module for sample test rules."""
 
-from pscodeanalyzer.engine import Report, Rule
-from pscodeanalyzer.rules.peoplecode import PeopleCodeParserListenerRule
+import re
+
+from pscodeanalyzer.engine import LineRule, RegexRule, Report, Rule
+from pscodeanalyzer.rules.peoplecode import (NotApplicableError,
+                                             PeopleCodeParserListenerRule,
+                                             SymbolDefinitionPhaseRule)
 from peoplecodeparser.PeopleCodeParser import PeopleCodeParser
 
 
-class LineLengthRule(Rule):
+class LineLengthRule(LineRule):
     """Rule to enforce maximum line lengths.
 
     The following configuration options apply:
@@ -20,25 +24,75 @@ class LineLengthRule(Rule):
         if self.max_length <= 0:
             raise ValueError('max_length must be a positive integer')
 
+    def check_line(self, line, text):
+        """Return a Report if the line is too long, or None."""
+        # Most lines are short, so the length is checked first
+        line_length = len(text)
+        if (line_length > self.max_length
+                and self.is_position_in_intervals(line)):
+            return Report(
+                self.code, self.default_message,
+                report_type=self.default_report_type, line=line, text=text,
+                detail=f'Line {line} has a length of {line_length}.')
+        return None
+
+
+class LineCountRule(Rule):
+    """Rule to enforce a maximum number of lines per file.
+
+    Overrides evaluate() with its original single-argument signature.
+
+    The following configuration options apply:
+    - "max_lines": an integer indicating the maximum acceptable number
+      of lines
+    """
+
+    def __init__(self, config):
+        """Construct a rule with the given configuration."""
+        super(LineCountRule, self).__init__(config)
+        self.max_lines = int(config.get('max_lines'))
+        if self.max_lines <= 0:
+            raise ValueError('max_lines must be a positive integer')
+
+    def evaluate(self, source):
+        """Return a Report if the file has too many lines."""
+        with open(source) as source_file:
+            line_count = sum(1 for _ in source_file)
+        if line_count > self.max_lines:
+            return [Report(
+                self.code, self.default_message,
+                report_type=self.default_report_type,
+                detail=f'The file has {line_count} lines.')]
+        return []
+
+
+class FirstMatchRule(RegexRule):
+    """Rule that only reports the first match of its pattern.
+
+    Overrides evaluate_file() to filter the reports of RegexRule.
+    """
+
     def evaluate_file(self, source_file):
-        """Evaluate the rule against the provided file-like object.
+        """Return the Report of the first match, if any."""
+        reports = super(FirstMatchRule, self).evaluate_file(source_file)
+        return reports[:1]
 
-        The file must already be open.
 
-        Returns a list of Report objects.
-        """
-        reports = []
-        for line, text in enumerate(source_file, start=1):
-            if self.is_position_in_intervals(line):
-                line_length = len(text)
-                if line_length > self.max_length:
-                    report = Report(
-                        self.code, self.default_message,
-                        report_type=self.default_report_type, line=line,
-                        text=text,
-                        detail=f'Line {line} has a length of {line_length}.')
-                    reports.append(report)
-        return reports
+class MatchCountRule(RegexRule):
+    """Rule that reports the number of matches of its pattern.
+
+    Overrides evaluate() with its original single-argument signature.
+    """
+
+    def evaluate(self, source):
+        """Return a single Report with the number of matches, if any."""
+        reports = super(MatchCountRule, self).evaluate(source)
+        if reports:
+            return [Report(
+                self.code, self.default_message,
+                report_type=self.default_report_type,
+                detail=f'The pattern was matched {len(reports)} times.')]
+        return []
 
 
 class LocalVariableNamingRule(PeopleCodeParserListenerRule):
@@ -59,10 +113,11 @@ class LocalVariableNamingRule(PeopleCodeParserListenerRule):
     def _process_single_variable(self, user_variable):
         """Verify if an individual variable name is compliant."""
         if user_variable:
-            var_name = user_variable.getText()
+            token = user_variable.symbol
+            var_name = token.text
             if not var_name.startswith(self.variable_prefix):
                 line = user_variable.parentCtx.start.line
-                column = user_variable.getSymbol().column + 1
+                column = token.column + 1
                 message = (f'Variable name "{var_name}" does not start with '
                            f'"{self.variable_prefix}"')
                 report = Report(
@@ -82,7 +137,7 @@ class LocalVariableNamingRule(PeopleCodeParserListenerRule):
         line = ctx.start.line
         if self.is_position_in_intervals(line):
             user_variable = ctx.USER_VARIABLE()
-            if type(user_variable) is list:
+            if isinstance(user_variable, list):
                 for uv in user_variable:
                     self._process_single_variable(uv)
             else:
@@ -113,3 +168,55 @@ class LocalVariableNamingRule(PeopleCodeParserListenerRule):
             Local number &var6 = (&var2 + &var3) * &var4;
         """
         self._verify_user_variables(ctx)
+
+
+class TokenCountRule(PeopleCodeParserListenerRule):
+    """Rule to enforce a maximum number of tokens per program.
+
+    Programs with syntax errors are not checked.
+
+    The following configuration options apply:
+    - "max_tokens": an integer indicating the maximum acceptable number
+      of tokens
+    """
+
+    def __init__(self, config):
+        """Initialize the rule."""
+        super(TokenCountRule, self).__init__(config)
+        self.max_tokens = int(config.get('max_tokens'))
+        if self.max_tokens <= 0:
+            raise ValueError('max_tokens must be a positive integer')
+
+    def reset(self):
+        """Reset the rule for a new evaluation."""
+        super(TokenCountRule, self).reset()
+        self.token_count = 0
+
+    def visitTerminal(self, node):
+        """Event triggered when a token is found."""
+        self.token_count += 1
+
+    def visitErrorNode(self, node):
+        """Event triggered when a syntax error is found."""
+        raise NotApplicableError('Programs with syntax errors are not '
+                                 'checked')
+
+    # Exit a parse tree produced by PeopleCodeParser#program.
+    def exitProgram(self, ctx: PeopleCodeParser.ProgramContext):
+        """Event triggered when the end of a program is found."""
+        if self.token_count > self.max_tokens:
+            report = Report(
+                self.code, self.default_message,
+                report_type=self.default_report_type,
+                detail=f'The program has {self.token_count} tokens.')
+            self.reports.append(report)
+
+
+class LocalDefinitionPhaseRule(SymbolDefinitionPhaseRule):
+    """Symbol definition phase with a sentinel for local variables.
+
+    The sentinel rules out reports, but not the annotations that the
+    following SymbolReferencePhaseRule inherits.
+    """
+
+    sentinel = re.compile(rb'(?i)\bLocal\b')
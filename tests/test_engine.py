@@ -0,0 +1,81 @@
+"""Engine tests."""
+
+import os.path
+import re
+
+import pscodeanalyzer.engine as psca
+
+
+def test_add_interval_str():
+    """Test parsing intervals from strings."""
+    rule = psca.Rule({'code': 1})
+    for interval in ('3-5', '8-', '10', ' 12 ', '0', '7-6', 'x', '-4',
+                     '1-2-3'):
+        rule.add_interval_str(interval)
+    assert rule.intervals == [(3, 5), (8, None), (10, 10), (12, 12)]
+
+
+def test_extract_required_literal():
+    """Test the literal that regular expression matches must contain."""
+    cases = [
+        (rb'\bSQLExec\b', b'SQLExec'),
+        (rb'foo\.bar', b'foo.bar'),
+        (rb'\dabc\s', b'abc'),
+        (rb'tab\there', b'tab\there'),
+        (rb'\x41BC', None),
+        (rb'\101BC', None),
+        (rb'(a)\1bc', None),
+        (rb'colou?r', b'colo'),
+        (rb'ab+c', b'ab'),
+        (rb'x{2}yz', b'yz'),
+        (rb'abc*d', b'ab'),
+        (rb'[abc]def', b'def'),
+        (rb'[]x]yz', b'yz'),
+        (rb'[^\]]yz', b'yz'),
+        (rb'foo|bar', None),
+        (rb'(?i)foo', None),
+    ]
+    for pattern, literal in cases:
+        regex = re.compile(pattern)
+        assert psca._extract_required_literal(regex) == literal, \
+            f'Unexpected literal for {pattern}'
+
+
+def test_regex_rule_required_literal(tmp_path):
+    """Test that the literal prefilter never hides a match."""
+    source_file = tmp_path / 'sample.txt'
+    source_file.write_bytes(b'xyz\nABC\n')
+    cases = [
+        (rb'\x41BC', False, 1),
+        (rb'\101BC', False, 1),
+        (rb'\x41BC', True, 0),
+        (rb'\x41BD', True, 1),
+        (rb'y\x7a', False, 1),
+    ]
+    for pattern, invert, report_count in cases:
+        rule = psca.RegexRule({'code': 1, 'pattern': pattern,
+                               'invert': invert})
+        rule.reset()
+        reports = rule.evaluate(str(source_file))
+        assert len(reports) == report_count, \
+            f'Unexpected reports for {pattern} (invert: {invert})'
+
+
+def test_process_input(tmp_path):
+    """Test that directories are walked as os.walk would."""
+    for sub_dir in ('d1', 'd2', os.path.join('d1', 'd3')):
+        (tmp_path / sub_dir).mkdir()
+    for source_file in ('a.txt', os.path.join('d1', 'b.txt'),
+                        os.path.join('d2', 'c.txt'),
+                        os.path.join('d1', 'd3', 'e.txt')):
+        (tmp_path / source_file).write_text('x')
+    (tmp_path / 'link.txt').symlink_to(tmp_path / 'a.txt')
+    (tmp_path / 'link').symlink_to(tmp_path / 'd1', target_is_directory=True)
+    found_files = list(psca._process_input([str(tmp_path)]))
+    expected_files = [os.path.join(base_dir, filename)
+                      for base_dir, _, filenames in os.walk(str(tmp_path))
+                      for filename in filenames]
+    assert len(found_files) == 5
+    assert found_files == expected_files
+    assert list(psca._process_input([str(tmp_path / 'a.txt')])) == \
+        [str(tmp_path / 'a.txt')]
@@ -2,6 +2,7 @@
 
 import os.path
 import pscodeanalyzer.engine as psca
+import pscodeanalyzer.rules.peoplecode as peoplecode
 
 
 _TESTS_DIR = os.path.dirname(__file__)
@@ -60,10 +61,9 @@ def test_program_1():
     )
     file_reports = psca.analyze([source_file], _SETTINGS_FILE,
                                 profile='test_02')
-    reports = file_reports[0].reports
     # The elements of the found_errors and expected_errors sets are
     # tuples with three elements: (<rule code>, <line>, <column>)
-    found_errors = {(r.rule_code, r.line, r.column) for r in reports}
+    found_errors = file_reports[0].positions
     expected_errors = {
         (1, 852, 13),
         (2, 850, 16),
@@ -121,3 +121,112 @@ def test_variables():
     unexpected_errors = found_errors - expected_errors
     assert len(unexpected_errors) == 0, \
         f'Unexpected errors: {unexpected_errors}'
+
+
+def test_variables_cached(tmp_path):
+    """Test that cached parse trees give the same results."""
+    source_file = os.path.join(_TESTS_DIR, 'variable_names.ppl')
+    substitutions = {'CACHE_DIR': str(tmp_path)}
+    found_errors = []
+    for _ in range(2):
+        file_reports = psca.analyze([source_file], _SETTINGS_FILE,
+                                    profile='test_07',
+                                    substitutions=substitutions)
+        found_errors.append({(r.line, r.column)
+                             for r in file_reports[0].reports})
+    assert len(found_errors[0]) == 10
+    assert found_errors[0] == found_errors[1]
+    assert len(list(tmp_path.glob('*.pickle'))) == 1
+
+
+def test_sql_exec_utf16(tmp_path):
+    """Test that sentinels do not skip files in other encodings."""
+    source_file = tmp_path / 'program.ppl'
+    source_file.write_text('Local string &x;\n'
+                           'SQLExec("SELECT 1 FROM PS_INSTALLATION", &x);\n',
+                           encoding='utf-16')
+    file_reports = psca.analyze([str(source_file)], _SETTINGS_FILE,
+                                profile='test_10')
+    assert file_reports and file_reports[0].positions == {(1, 2, 1)}
+
+
+def test_tree_cache(tmp_path, monkeypatch):
+    """Test that proxies share parse trees and syntax errors in memory."""
+    source_file = tmp_path / 'program.ppl'
+    source_file.write_text('Local string &a = "x";\n'
+                           'If &a = "y" Then\n'
+                           '  &b = ;\n'
+                           'End-If;\n')
+    parsed_files = []
+    parse = peoplecode.PeopleCodeParserProxy._parse
+
+    def counting_parse(proxy):
+        parsed_files.append(proxy.file_path)
+        return parse(proxy)
+
+    monkeypatch.setattr(peoplecode, '_tree_caches', {})
+    monkeypatch.setattr(peoplecode.PeopleCodeParserProxy, '_parse',
+                        counting_parse)
+    file_reports = psca.analyze([str(source_file)], _SETTINGS_FILE,
+                                profile='test_12')
+    assert parsed_files == [str(source_file)]
+    reports = [(r.rule_code, r.line, r.column, r.message)
+               for r in file_reports[0].reports]
+    half = len(reports) // 2
+    assert reports[:half] == reports[half:]
+    assert ('PeopleCodeParser', 3, 8) in {r[:3] for r in reports[:half]}
+    assert (3, 1, 14) in {r[:3] for r in reports[:half]}
+
+
+def test_program_1_reanalyzed():
+    """Test that a file analyzed again is not limited to old intervals."""
+    source_file = os.path.join(_TESTS_DIR,
+                               'PTPG_WORKREC.FUNCLIB.FieldFormula.ppl')
+    file_reports = psca.analyze([(source_file, None, [(850, 853)]),
+                                 source_file],
+                                _SETTINGS_FILE, profile='test_02')
+    assert len(file_reports[0].reports) == 17
+    assert len(file_reports[1].reports) == 1470
+
+
+def test_tree_cache_sizes(monkeypatch):
+    """Test that proxies only share in-memory caches of the same size."""
+    monkeypatch.setattr(peoplecode, '_tree_caches', {})
+    proxies = [peoplecode.PeopleCodeParserProxy({'evaluators': [],
+                                                 'tree_cache_size': size})
+               for size in (1, 8, 8, 0)]
+    assert proxies[0]._tree_cache is not proxies[1]._tree_cache
+    assert proxies[1]._tree_cache is proxies[2]._tree_cache
+    assert proxies[3]._tree_cache is None
+    assert sorted(peoplecode._tree_caches) == [1, 8]
+
+
+def test_generic_listener_events(tmp_path):
+    """Test rules handling generic events alongside other rules."""
+    source_file = os.path.join(_TESTS_DIR, 'variable_names.ppl')
+    error_file = tmp_path / 'program.ppl'
+    error_file.write_text('Local string &a = "x";\n'
+                          'If &a = "y" Then\n'
+                          '  &b = ;\n'
+                          '  &a = &a | "z";\n'
+                          'End-If;\n')
+    file_reports = psca.analyze([source_file, str(error_file)],
+                                _SETTINGS_FILE, profile='test_15')
+    found_errors = [{(r.rule_code, r.line) for r in fr.reports}
+                    for fr in file_reports]
+    assert (19, None) in found_errors[0]
+    assert len(found_errors[0]) == 8
+    # The syntax error makes TokenCountRule not applicable
+    assert found_errors[1] == {('PeopleCodeParser', 3), (3, 1)}
+
+
+def test_inherited_annotations_sentinel(tmp_path):
+    """Test that sentinels do not skip rules whose annotations are used."""
+    source_file = os.path.join(_TESTS_DIR, 'variable_names.ppl')
+    other_file = tmp_path / 'program.ppl'
+    other_file.write_text('&var1 = 1;\n')
+    for source_files in ([str(other_file)], [source_file, str(other_file)]):
+        file_reports = psca.analyze(source_files, _SETTINGS_FILE,
+                                    profile='test_16')
+        assert [fr.file_path for fr in file_reports] == [str(other_file)]
+        assert file_reports[0].positions == {(2, 1, 1)}
@@ -28,3 +28,191 @@ def test_plain_text():
     unexpected_errors = found_errors - expected_errors
     assert len(unexpected_errors) == 0, \
         f'Unexpected errors: {unexpected_errors}'
+
+
+def test_plain_text_line_breaks(tmp_path):
+    """Test that CR+LF and CR line breaks yield the same line numbers."""
+    with open(os.path.join(_TESTS_DIR, 'plain_text_sample.txt'), 'rb') as f:
+        contents = f.read()
+    for line_break in (b'\r\n', b'\r'):
+        source_file = tmp_path / 'sample.txt'
+        source_file.write_bytes(contents.replace(b'\n', line_break))
+        file_reports = psca.analyze([str(source_file)], _SETTINGS_FILE,
+                                    profile='test_04')
+        found_errors = {(r.rule_code, r.line, r.column)
+                        for r in file_reports[0].reports
+                        if r.rule_code == 4}
+        assert found_errors == {(4, 7, 65)}, \
+            f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_proxy():
+    """Test regular expression rules sharing a file through a Proxy."""
+    source_file = os.path.join(_TESTS_DIR, 'plain_text_sample.txt')
+    file_reports = psca.analyze([source_file], _SETTINGS_FILE,
+                                profile='test_05')
+    found_errors = {(r.rule_code, r.line, r.column)
+                    for r in file_reports[0].reports}
+    expected_errors = {
+        (4, 5, 38),
+        (5, None, None),
+    }
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors ^ expected_errors}'
+
+
+def test_plain_text_parallel(tmp_path):
+    """Test that parallel analysis of an iterator keeps input order."""
+    with open(os.path.join(_TESTS_DIR, 'plain_text_sample.txt'), 'rb') as f:
+        contents = f.read()
+    source_files = []
+    for i in range(4):
+        source_file = tmp_path / f'sample_{i}.txt'
+        source_file.write_bytes(contents)
+        source_files.append(str(source_file))
+    file_reports = psca.analyze(iter(source_files), _SETTINGS_FILE,
+                                profile='test_04', jobs=2)
+    assert [fr.file_path for fr in file_reports] == source_files
+    for fr in file_reports:
+        found_errors = {(r.rule_code, r.line) for r in fr.reports}
+        assert found_errors == {(4, 7), (5, None), (6, 3)}, \
+            f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_parallel_not_exhaustive(tmp_path):
+    """Test that parallel analysis stops at the same file as serial."""
+    contents = ['WARN', '', 'WARN', 'ERROR', 'WARN', 'ERROR', 'WARN', '']
+    source_files = []
+    for i, text in enumerate(contents * 2):
+        source_file = tmp_path / f'sample_{i}.txt'
+        source_file.write_text(f'{text}\n')
+        source_files.append(str(source_file))
+    found_files = []
+    for jobs in (1, 3):
+        file_reports = psca.analyze(source_files, _SETTINGS_FILE,
+                                    profile='test_14', exhaustive=False,
+                                    jobs=jobs)
+        found_files.append([fr.file_path for fr in file_reports])
+    assert found_files[0] == [source_files[i] for i in (0, 2, 3)]
+    assert found_files[1] == found_files[0]
+
+
+def test_plain_text_intervals_per_file():
+    """Test that intervals only apply to the file they are given for."""
+    source_file = os.path.join(_TESTS_DIR, 'plain_text_sample.txt')
+    file_reports = psca.analyze([(source_file, None, [(1, 2)]), source_file],
+                                _SETTINGS_FILE, profile='test_04')
+    found_errors = [{(r.rule_code, r.line) for r in fr.reports}
+                    for fr in file_reports]
+    expected_errors = [
+        {(5, None)},
+        {(4, 7), (5, None), (6, 3)},
+    ]
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_regex_intervals():
+    """Test that regular expression matches are limited to intervals."""
+    source_file = os.path.join(_TESTS_DIR, 'plain_text_sample.txt')
+    file_reports = psca.analyze([(source_file, None, [(1, 1), (4, 5)]),
+                                 (source_file, None, [(6, None)])],
+                                _SETTINGS_FILE, profile='test_05')
+    found_errors = [fr.positions for fr in file_reports]
+    expected_errors = [
+        {(4, 5, 38), (5, None, None)},
+        {(5, None, None)},
+    ]
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_fused_proxy():
+    """Test regular expression rules fused into a single scan."""
+    source_file = os.path.join(_TESTS_DIR, 'plain_text_sample.txt')
+    file_reports = psca.analyze([source_file, (source_file, None, [(7, 7)])],
+                                _SETTINGS_FILE, profile='test_06')
+    found_errors = [fr.positions for fr in file_reports]
+    expected_errors = [
+        {(4, 5, 38), (5, None, None), (7, 3, 13), (8, 7, 63)},
+        {(5, None, None), (8, 7, 63)},
+    ]
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_fused_proxy_overlaps(tmp_path):
+    """Test that fused rules report what they would on their own."""
+    source_files = []
+    for i, text in enumerate(('xaaa', 'xabc', 'xa', 'b')):
+        source_file = tmp_path / f'sample_{i}.txt'
+        source_file.write_text(f'{text}\n')
+        source_files.append(str(source_file))
+    file_reports = psca.analyze(source_files, _SETTINGS_FILE,
+                                profile='test_17')
+    found_errors = [fr.positions for fr in file_reports]
+    expected_errors = [
+        {(20, 1, 1), (21, 1, 2)},
+        {(20, 1, 1), (21, 1, 2), (22, 1, 3)},
+        {(20, 1, 1), (21, 1, 2)},
+    ]
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_fused_line_proxy():
+    """Test line rules fused into a single pass over the file."""
+    source_file = os.path.join(_TESTS_DIR, 'plain_text_sample.txt')
+    file_reports = psca.analyze([source_file, (source_file, None, [(7, 7)])],
+                                _SETTINGS_FILE, profile='test_08')
+    found_errors = [{(r.rule_code, r.line) for r in fr.reports}
+                    for fr in file_reports]
+    expected_errors = [
+        {(6, 3), (7, 3), (9, 3), (9, 7)},
+        {(9, 7)},
+    ]
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_legacy_rule():
+    """Test plug-in rules that override evaluate(self, source)."""
+    source_file = os.path.join(_TESTS_DIR, 'plain_text_sample.txt')
+    file_reports = psca.analyze([source_file], _SETTINGS_FILE,
+                                profile='test_09')
+    found_errors = {(r.rule_code, r.line) for r in file_reports[0].reports}
+    expected_errors = {(10, None), (7, 3), (11, None)}
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors ^ expected_errors}'
+
+
+def test_plain_text_fused_proxy_source_types(tmp_path):
+    """Test that rules not applicable to a source type are not fused."""
+    source_file = tmp_path / 'sample.txt'
+    source_file.write_text('A foobar line.\n')
+    file_reports = psca.analyze([(str(source_file), 1),
+                                 (str(source_file), 99)],
+                                _SETTINGS_FILE, profile='test_11')
+    found_errors = [fr.positions for fr in file_reports]
+    expected_errors = [
+        {(13, 1, 3)},
+        {(12, 1, 3), (13, 1, 3)},
+    ]
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors}'
+
+
+def test_plain_text_regex_rule_subclasses():
+    """Test RegexRule subclasses that override evaluation methods."""
+    source_file = os.path.join(_TESTS_DIR, 'plain_text_sample.txt')
+    file_reports = psca.analyze([source_file], _SETTINGS_FILE,
+                                profile='test_13')
+    found_errors = {(r.rule_code, r.line, r.column, r.detail)
+                    for r in file_reports[0].reports}
+    expected_errors = {
+        (14, 1, 6, None),
+        (15, None, None, 'The pattern was matched 3 times.'),
+        (16, 3, 10, None),
+    }
+    assert found_errors == expected_errors, \
+        f'Unexpected errors: {found_errors ^ expected_errors}'